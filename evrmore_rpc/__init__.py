@@ -27,7 +27,8 @@ __version__ = "3.2.2"
 from evrmore_rpc.client import (
     EvrmoreClient,
     EvrmoreConfig,
-    EvrmoreRPCError
+    EvrmoreRPCError,
+    get_default_client
 )
 
 # Import common models
@@ -70,6 +71,7 @@ __all__ = [
     "EvrmoreClient",
     "EvrmoreConfig",
     "EvrmoreRPCError",
+    "get_default_client",
     
     # Base models
     "Amount", "Address", "Asset", "Transaction", "BaseBlock", "RPCResponse",
@@ -11,16 +11,31 @@ import json
 import time
 import asyncio
 import statistics
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from urllib.parse import urlparse
 import base64
 from decimal import Decimal
 import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
 from pydantic import BaseModel, Field
-from functools import wraps
+from functools import partial, wraps
 import inspect
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Import models
 from evrmore_rpc.models import (
     BlockchainInfo,
@@ -58,6 +73,50 @@ def format_command_args(*args: Any) -> List[str]:
             formatted_args.append(str(arg))
     return formatted_args
 
+class _OrjsonDecoder(json.JSONDecoder):
+    """JSON decoder that hands the document to orjson, for use as json.loads(cls=...)."""
+    
+    def __init__(self, **kwargs: Any):
+        pass
+    
+    def decode(self, s: str, *args: Any) -> Any:
+        return orjson.loads(s)
+
+def _allocate_timings(num_calls: int) -> Any:
+    """Allocate one latency slot per call, in integer nanoseconds, left at -1 until the call succeeds."""
+    if HAS_NUMPY:
+        return np.full(num_calls, -1, dtype=np.int64)
+    return [-1] * num_calls
+
+def _check_batch_size(batch_size: int) -> None:
+    """Reject stress test batch sizes that would split the calls into no requests."""
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+
+def _summarize_timings(timings: Any) -> Dict[str, float]:
+    """Compute latency statistics in milliseconds over the successful calls."""
+    if HAS_NUMPY:
+        # Convert from nanoseconds once, for all calls
+        valid = timings[timings >= 0].astype(np.float64) * 1e-6
+        if not valid.size:
+            raise EvrmoreRPCError("All stress test calls failed")
+        return {
+            "avg_time": float(valid.mean()),
+            "min_time": float(valid.min()),
+            "max_time": float(valid.max()),
+            "median_time": float(np.median(valid)),
+        }
+    
+    valid = [t * 1e-6 for t in timings if t >= 0]
+    if not valid:
+        raise EvrmoreRPCError("All stress test calls failed")
+    return {
+        "avg_time": sum(valid) / len(valid),
+        "min_time": min(valid),
+        "max_time": max(valid),
+        "median_time": statistics.median(valid),
+    }
+
 class EvrmoreConfig:
     """
     Parser for Evrmore configuration file (evrmore.conf).
@@ -195,7 +254,9 @@ class EvrmoreClient:
                  rpcport: Optional[int] = None,
                  testnet: bool = False,
                  timeout: int = 30,
-                 async_mode: Optional[bool] = None):
+                 async_mode: Optional[bool] = None,
+                 max_connections: int = 100,
+                 use_decimal: bool = False):
         """
         Initialize the RPC client.
         
@@ -208,8 +269,25 @@ class EvrmoreClient:
             testnet: Whether to use testnet
             timeout: Request timeout in seconds
             async_mode: Force async mode (True) or sync mode (False). If None, auto-detect based on context.
+            max_connections: Maximum number of pooled keep-alive connections to the RPC server
+            use_decimal: Decode floating point numbers in responses (e.g. amounts) as Decimal
+                instead of float, so they can be aggregated exactly without re-parsing.
+                Otherwise responses are decoded with orjson when it is installed.
         """
         self.timeout = timeout
+        self.max_connections = max_connections
+        self.use_decimal = use_decimal
+        # Extra keyword arguments for decoding responses with requests and aiohttp
+        self._json_kwargs: Dict[str, Any] = {}
+        self._async_json_kwargs: Dict[str, Any] = {}
+        if use_decimal:
+            self._json_kwargs = {'parse_float': Decimal}
+            self._async_json_kwargs = {'loads': partial(json.loads, parse_float=Decimal)}
+        elif HAS_ORJSON:
+            # orjson is much faster on large responses (e.g. verbose blocks),
+            # but cannot decode floats as Decimal
+            self._json_kwargs = {'cls': _OrjsonDecoder}
+            self._async_json_kwargs = {'loads': orjson.loads}
         self.testnet = testnet
         self.datadir = Path(datadir) if datadir else DEFAULT_DATADIR
         
@@ -303,6 +381,66 @@ class EvrmoreClient:
         
         return response_data["result"]
     
+    def _prepare_batch_payload(self, calls: List[Tuple[str, List[Any]]]) -> List[Dict[str, Any]]:
+        """
+        Prepare a JSON-RPC batch payload for a list of commands.
+        
+        Args:
+            calls: A list of (command, params) tuples
+            
+        Returns:
+            The JSON-RPC batch payload, with each request's id set to its index
+        """
+        payload = []
+        for i, (command, params) in enumerate(calls):
+            request = self._prepare_payload(command, *params)
+            request["id"] = i
+            payload.append(request)
+        return payload
+    
+    def _handle_batch_response(self, response_data: Any, num_calls: int,
+                               return_exceptions: bool = False) -> List[Any]:
+        """
+        Handle a JSON-RPC batch response.
+        
+        The server may answer batch requests in any order, so responses are matched
+        back to their requests by id.
+        
+        Args:
+            response_data: The JSON-RPC batch response data
+            num_calls: The number of requests in the batch
+            return_exceptions: Return an EvrmoreRPCError in place of the result of each
+                failed command instead of raising it
+            
+        Returns:
+            The results of the RPC commands, in request order
+            
+        Raises:
+            EvrmoreRPCError: If the batch or any of its commands fails
+        """
+        if isinstance(response_data, dict):
+            # A single error object is returned when the batch itself is rejected;
+            # any other single object can't be matched to the requests
+            if response_data.get("error") is not None:
+                self._handle_response(response_data)
+            raise EvrmoreRPCError("Invalid batch response")
+        
+        if not isinstance(response_data, list):
+            raise EvrmoreRPCError("Invalid batch response")
+        
+        responses = {item.get("id"): item for item in response_data if isinstance(item, dict)}
+        results = []
+        for i in range(num_calls):
+            try:
+                if i not in responses:
+                    raise EvrmoreRPCError(f"No response for batch request {i}")
+                results.append(self._handle_response(responses[i]))
+            except EvrmoreRPCError as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+    
     # Synchronous methods
     
     def initialize_sync(self) -> None:
@@ -310,6 +448,11 @@ class EvrmoreClient:
         if self.sync_session is None:
             self.sync_session = requests.Session()
             self.sync_session.headers.update(self.headers)
+            # Size the pool so concurrent threads reuse connections instead of
+            # discarding them once the default pool of 10 is full
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_connections)
+            self.sync_session.mount("http://", adapter)
+            self.sync_session.mount("https://", adapter)
     
     def __enter__(self) -> 'EvrmoreClient':
         """Enter the synchronous context manager."""
@@ -320,6 +463,7 @@ class EvrmoreClient:
         """Exit the synchronous context manager."""
         if self.sync_session:
             self.sync_session.close()
+            self.sync_session = None
     
     def execute_command_sync(self, command: str, *args: Any) -> Any:
         """
@@ -353,21 +497,72 @@ class EvrmoreClient:
             if response.status_code != 200:
                 raise EvrmoreRPCError(f"HTTP error {response.status_code}: {response.text}")
             
-            response_data = response.json()
+            response_data = response.json(**self._json_kwargs)
             return self._handle_response(response_data)
         except requests.RequestException as e:
             raise EvrmoreRPCError(f"Request failed: {str(e)}")
         except json.JSONDecodeError:
             raise EvrmoreRPCError("Invalid JSON response")
     
+    def batch_call_sync(self, calls: List[Tuple[str, List[Any]]],
+                        return_exceptions: bool = False) -> List[Any]:
+        """
+        Execute several RPC commands synchronously in a single JSON-RPC batch request.
+        
+        Args:
+            calls: A list of (command, params) tuples
+            return_exceptions: Return an EvrmoreRPCError in place of the result of each
+                failed command instead of raising it
+            
+        Returns:
+            The results of the RPC commands, in the same order as calls
+            
+        Raises:
+            EvrmoreRPCError: If the request or any of the commands fails
+        """
+        if not calls:
+            return []
+        
+        if self.sync_session is None:
+            self.initialize_sync()
+        
+        if self.sync_session is None:
+            raise EvrmoreRPCError("Session not initialized")
+        
+        payload = self._prepare_batch_payload(calls)
+        
+        try:
+            response = self.sync_session.post(
+                self.url,
+                json=payload,
+                timeout=self.timeout
+            )
+            
+            if response.status_code != 200:
+                raise EvrmoreRPCError(f"HTTP error {response.status_code}: {response.text}")
+            
+            response_data = response.json(**self._json_kwargs)
+            return self._handle_batch_response(response_data, len(calls), return_exceptions)
+        except requests.RequestException as e:
+            raise EvrmoreRPCError(f"Request failed: {str(e)}")
+        except json.JSONDecodeError:
+            raise EvrmoreRPCError("Invalid JSON response")
+    
     # Asynchronous methods
     
     async def initialize_async(self) -> None:
         """Initialize the asynchronous client session."""
         if self.async_session is None or self.async_session.closed:
+            # Connections are kept alive and reused across calls. The node's RPC
+            # server speaks HTTP/1.1 only, so concurrent requests each hold one
+            # pooled connection rather than being multiplexed over a single one.
             self.async_session = aiohttp.ClientSession(
                 headers=self.headers,
-                timeout=aiohttp.ClientTimeout(total=self.timeout)
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections,
+                    limit_per_host=self.max_connections
+                )
             )
     
     async def __aenter__(self) -> 'EvrmoreClient':
@@ -379,6 +574,7 @@ class EvrmoreClient:
         """Exit the async context manager."""
         if self.async_session and not self.async_session.closed:
             await self.async_session.close()
+            self.async_session = None
     
     def __del__(self):
         """
@@ -476,7 +672,7 @@ class EvrmoreClient:
                     text = await response.text()
                     raise EvrmoreRPCError(f"HTTP error {response.status}: {text}")
                 
-                response_data = await response.json()
+                response_data = await response.json(**self._async_json_kwargs)
                 return self._handle_response(response_data)
         except aiohttp.ClientError as e:
             raise EvrmoreRPCError(f"Request failed: {str(e)}")
@@ -485,6 +681,52 @@ class EvrmoreClient:
         except json.JSONDecodeError:
             raise EvrmoreRPCError("Invalid JSON response")
     
+    async def batch_call_async(self, calls: List[Tuple[str, List[Any]]],
+                               return_exceptions: bool = False) -> List[Any]:
+        """
+        Execute several RPC commands asynchronously in a single JSON-RPC batch request.
+        
+        Args:
+            calls: A list of (command, params) tuples
+            return_exceptions: Return an EvrmoreRPCError in place of the result of each
+                failed command instead of raising it
+            
+        Returns:
+            The results of the RPC commands, in the same order as calls
+            
+        Raises:
+            EvrmoreRPCError: If the request or any of the commands fails
+        """
+        if not calls:
+            return []
+        
+        if self.async_session is None or self.async_session.closed:
+            await self.initialize_async()
+        
+        if self.async_session is None:
+            raise EvrmoreRPCError("Session not initialized")
+        
+        payload = self._prepare_batch_payload(calls)
+        
+        try:
+            async with self.async_session.post(
+                self.url,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            ) as response:
+                if response.status != 200:
+                    text = await response.text()
+                    raise EvrmoreRPCError(f"HTTP error {response.status}: {text}")
+                
+                response_data = await response.json(**self._async_json_kwargs)
+                return self._handle_batch_response(response_data, len(calls), return_exceptions)
+        except aiohttp.ClientError as e:
+            raise EvrmoreRPCError(f"Request failed: {str(e)}")
+        except asyncio.TimeoutError:
+            raise EvrmoreRPCError(f"Request timed out after {self.timeout} seconds")
+        except json.JSONDecodeError:
+            raise EvrmoreRPCError("Invalid JSON response")
+    
     # Polymorphic methods
     
     def initialize(self) -> Union[None, asyncio.coroutine]:
@@ -534,6 +776,36 @@ class EvrmoreClient:
             cleanup_func=None
         )
     
+    def batch_call(self, calls: List[Tuple[str, List[Any]]], return_exceptions: bool = False) -> Any:
+        """
+        Execute several RPC commands in a single JSON-RPC batch request (sync or async).
+        
+        Batching saves one HTTP round-trip per command, which matters when fetching
+        many independent items such as blocks or previous transactions.
+        
+        Args:
+            calls: A list of (command, params) tuples,
+                e.g. [("getblockhash", [1]), ("getblockhash", [2])]
+            return_exceptions: Return an EvrmoreRPCError in place of the result of each
+                failed command instead of raising it
+            
+        Returns:
+            The results of the RPC commands in the same order as calls,
+            or a coroutine if in async context
+        """
+        # If async_mode is explicitly set, use that
+        if self._async_mode is not None:
+            if self._async_mode:
+                return self.batch_call_async(calls, return_exceptions)
+            else:
+                return self.batch_call_sync(calls, return_exceptions)
+        
+        # Otherwise, use the sync_or_async utility to automatically choose the right implementation
+        return sync_or_async(
+            self.batch_call_sync,
+            self.batch_call_async
+        )(calls, return_exceptions)
+    
     # Add this new method for session management
     def _get_or_create_sync_session(self):
         """Get or create a synchronous session."""
@@ -602,7 +874,8 @@ class EvrmoreClient:
     
     # Stress testing
     
-    def stress_test_sync(self, num_calls: int = 100, command: str = "getblockcount", concurrency: int = 10) -> Dict[str, Any]:
+    def stress_test_sync(self, num_calls: int = 100, command: str = "getblockcount", concurrency: int = 10,
+                         batch_size: int = 1) -> Dict[str, Any]:
         """
         Run a synchronous stress test with the specified command.
         
@@ -610,75 +883,58 @@ class EvrmoreClient:
             num_calls: Number of calls to make
             command: RPC command to execute
             concurrency: Number of concurrent calls (simulated with threads)
+            batch_size: Number of calls to send per JSON-RPC batch request
             
         Returns:
             Dictionary with test results
+            
+        Raises:
+            ValueError: If batch_size is less than 1
         """
-        import threading
-        from queue import Queue
-        
+        _check_batch_size(batch_size)
         if self.sync_session is None:
             self.initialize_sync()
         
-        start_time = time.time()
-        results = []
-        result_queue = Queue()
+        start_time = time.perf_counter_ns()
+        timings = _allocate_timings(num_calls)
         last_result = None
         
-        def worker():
-            while True:
-                try:
-                    call_start = time.time()
+        def make_call(start):
+            size = min(batch_size, num_calls - start)
+            call_start = time.perf_counter_ns()
+            try:
+                if size == 1:
                     result = self.execute_command_sync(command)
-                    call_end = time.time()
-                    result_queue.put(((call_end - call_start) * 1000, result))  # Convert to ms
-                except Exception as e:
-                    print(f"Error during stress test: {e}")
-                    result_queue.put((float('inf'), None))
-                break
-        
-        # Process in batches to control concurrency
-        for i in range(0, num_calls, concurrency):
-            batch_size = min(concurrency, num_calls - i)
-            threads = []
-            
-            for _ in range(batch_size):
-                thread = threading.Thread(target=worker)
-                thread.start()
-                threads.append(thread)
-            
-            # Wait for all threads to complete
-            for thread in threads:
-                thread.join()
-            
-            # Collect results
-            for _ in range(batch_size):
-                time_taken, result = result_queue.get()
-                results.append(time_taken)
-                last_result = result
-        
-        end_time = time.time()
-        total_time = end_time - start_time
+                else:
+                    result = self.batch_call_sync([(command, [])] * size)[-1]
+                elapsed = time.perf_counter_ns() - call_start
+                # Spread the batch round-trip evenly over its calls
+                timings[start:start + size] = [elapsed // size] * size
+                return result
+            except Exception as e:
+                print(f"Error during stress test: {e}")
+                return None
         
-        # Filter out failed calls (infinity)
-        valid_results = [r for r in results if r != float('inf')]
+        # Keep up to `concurrency` requests of up to batch_size calls each in flight
+        # on a shared thread pool (the session's connection pool is thread-safe for posts)
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for result in executor.map(make_call, range(0, num_calls, batch_size)):
+                last_result = result
         
-        if not valid_results:
-            raise EvrmoreRPCError("All stress test calls failed")
+        total_time = (time.perf_counter_ns() - start_time) / 1e9
         
         return {
             "total_time": total_time,
             "requests_per_second": num_calls / total_time,
-            "avg_time": sum(valid_results) / len(valid_results),
-            "min_time": min(valid_results),
-            "max_time": max(valid_results),
-            "median_time": statistics.median(valid_results),
+            **_summarize_timings(timings),
             "num_calls": num_calls,
             "concurrency": concurrency,
+            "batch_size": batch_size,
             "last_result": last_result
         }
     
-    async def stress_test_async(self, num_calls: int = 100, command: str = "getblockcount", concurrency: int = 10) -> Dict[str, Any]:
+    async def stress_test_async(self, num_calls: int = 100, command: str = "getblockcount", concurrency: int = 10,
+                                batch_size: int = 1) -> Dict[str, Any]:
         """
         Run an asynchronous stress test with the specified command.
         
@@ -686,67 +942,64 @@ class EvrmoreClient:
             num_calls: Number of calls to make
             command: RPC command to execute
             concurrency: Number of concurrent calls
+            batch_size: Number of calls to send per JSON-RPC batch request
             
         Returns:
             Dictionary with test results
+            
+        Raises:
+            ValueError: If batch_size is less than 1
         """
+        _check_batch_size(batch_size)
         if self.async_session is None or self.async_session.closed:
             await self.initialize_async()
         
-        start_time = time.time()
-        results = []
-        tasks = set()
+        start_time = time.perf_counter_ns()
+        timings = _allocate_timings(num_calls)
         
-        async def make_call():
-            call_start = time.time()
+        async def make_call(start):
+            size = min(batch_size, num_calls - start)
+            call_start = time.perf_counter_ns()
             try:
-                result = await self.execute_command_async(command)
-                call_end = time.time()
-                results.append((call_end - call_start) * 1000)  # Convert to ms
+                if size == 1:
+                    result = await self.execute_command_async(command)
+                else:
+                    result = (await self.batch_call_async([(command, [])] * size))[-1]
+                elapsed = time.perf_counter_ns() - call_start
+                # Spread the batch round-trip evenly over its calls
+                timings[start:start + size] = [elapsed // size] * size
                 return result
             except Exception as e:
                 print(f"Error during stress test: {e}")
-                results.append(float('inf'))
                 return None
         
-        # Process in batches to control concurrency
+        # Split the calls into requests of up to batch_size calls each
+        request_starts = iter(range(0, num_calls, batch_size))
         last_result = None
-        for i in range(0, num_calls, concurrency):
-            batch_size = min(concurrency, num_calls - i)
-            batch_tasks = set()
-            
-            for _ in range(batch_size):
-                task = asyncio.create_task(make_call())
-                batch_tasks.add(task)
-                tasks.add(task)
-            
-            # Wait for the current batch to complete
-            batch_results = await asyncio.gather(*batch_tasks)
-            if batch_results:
-                last_result = batch_results[-1]
         
-        end_time = time.time()
-        total_time = end_time - start_time
+        async def worker():
+            nonlocal last_result
+            # Workers share one iterator, so a new request starts as soon as any
+            # in-flight request finishes, without creating a task per call
+            for start in request_starts:
+                last_result = await make_call(start)
         
-        # Filter out failed calls (infinity)
-        valid_results = [r for r in results if r != float('inf')]
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
         
-        if not valid_results:
-            raise EvrmoreRPCError("All stress test calls failed")
+        total_time = (time.perf_counter_ns() - start_time) / 1e9
         
         return {
             "total_time": total_time,
             "requests_per_second": num_calls / total_time,
-            "avg_time": sum(valid_results) / len(valid_results),
-            "min_time": min(valid_results),
-            "max_time": max(valid_results),
-            "median_time": statistics.median(valid_results),
+            **_summarize_timings(timings),
             "num_calls": num_calls,
             "concurrency": concurrency,
+            "batch_size": batch_size,
             "last_result": last_result
         }
     
-    def stress_test(self, num_calls: int = 100, command: str = "getblockcount", concurrency: int = 10) -> Dict[str, Any]:
+    def stress_test(self, num_calls: int = 100, command: str = "getblockcount", concurrency: int = 10,
+                    batch_size: int = 1) -> Dict[str, Any]:
         """
         Run a stress test with the specified command (sync or async).
         
@@ -754,6 +1007,7 @@ class EvrmoreClient:
             num_calls: Number of calls to make
             command: RPC command to execute
             concurrency: Number of concurrent calls
+            batch_size: Number of calls to send per JSON-RPC batch request
             
         Returns:
             Dictionary with test results
@@ -761,15 +1015,15 @@ class EvrmoreClient:
         # If async_mode is explicitly set, use that
         if self._async_mode is not None:
             if self._async_mode:
-                return self.stress_test_async(num_calls, command, concurrency)
+                return self.stress_test_async(num_calls, command, concurrency, batch_size)
             else:
-                return self.stress_test_sync(num_calls, command, concurrency)
+                return self.stress_test_sync(num_calls, command, concurrency, batch_size)
         
         # Otherwise, use the sync_or_async utility to automatically choose the right implementation
         return sync_or_async(
             self.stress_test_sync,
             self.stress_test_async
-        )(num_calls, command, concurrency)
+        )(num_calls, command, concurrency, batch_size)
     
     def force_sync(self):
         """
@@ -802,4 +1056,30 @@ class EvrmoreClient:
             self: The client instance with reset state
         """
         self._async_mode = None
-        return self 
\ No newline at end of file
+        return self
+
+# Clients shared by get_default_client, keyed by their constructor options
+_default_clients: Dict[Tuple[Tuple[str, Any], ...], EvrmoreClient] = {}
+_default_clients_lock = threading.Lock()
+
+def get_default_client(**kwargs: Any) -> EvrmoreClient:
+    """
+    Get a process-wide client shared by every caller passing the same options.
+    
+    Modules that each need a client can use this instead of constructing their
+    own, so that configuration is parsed once and a single connection pool is
+    shared. The client is created on first use. Since force_sync() and
+    force_async() would affect every caller, pass async_mode instead.
+    
+    Args:
+        **kwargs: Options for EvrmoreClient. Values must be hashable.
+        
+    Returns:
+        The shared EvrmoreClient for these options
+    """
+    key = tuple(sorted(kwargs.items()))
+    with _default_clients_lock:
+        client = _default_clients.get(key)
+        if client is None:
+            client = _default_clients[key] = EvrmoreClient(**kwargs)
+        return client
@@ -3,7 +3,7 @@ Ultra-minimal stub file for EvrmoreClient - VS CODE OPTIMIZED
 Only shows Evrmore RPC commands in intellisense.
 """
 
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from decimal import Decimal
 
 # This is a special class that only defines the RPC methods
@@ -780,10 +780,18 @@ class EvrmoreClient:
         pass
     
     # Core methods - these are needed but kept at the end to prioritize RPC commands
+    def batch_call(self, calls: List[Tuple[str, List[Any]]], return_exceptions: bool = False) -> List[Any]: 
+        """Execute several RPC commands in a single JSON-RPC batch request."""
+        pass
+    
     def reset(self) -> None: 
         """Reset the client state."""
         pass
     
     def close(self) -> None: 
         """Close the client and release resources."""
-        pass 
\ No newline at end of file
+        pass
+
+def get_default_client(**kwargs: Any) -> EvrmoreClient:
+    """Get a process-wide client shared by every caller passing the same options."""
+    pass
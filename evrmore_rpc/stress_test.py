@@ -17,10 +17,13 @@ from rich import box
 
 # Import client directly to avoid circular imports
 from evrmore_rpc.client import EvrmoreClient
-from evrmore_rpc.utils import sync_or_async, is_async_context
+from evrmore_rpc.utils import sync_or_async
 
 console = Console()
 
+# Longest "Last Result" shown in the results table, in characters
+MAX_LAST_RESULT_LENGTH = 4096
+
 async def run_stress_test_async(
     url: Optional[str] = None,
     datadir: Optional[str] = None,
@@ -30,7 +33,8 @@ async def run_stress_test_async(
     timeout: int = 30,
     num_calls: int = 100,
     command: str = "getblockcount",
-    concurrency: int = 10
+    concurrency: int = 10,
+    batch_size: int = 1
 ) -> Dict[str, Any]:
     """
     Run asynchronous stress test with the specified parameters
@@ -45,6 +49,7 @@ async def run_stress_test_async(
         num_calls: Number of calls to make
         command: RPC command to execute
         concurrency: Concurrency level for test
+        batch_size: Number of calls to send per JSON-RPC batch request
         
     Returns:
         Dictionary with test results
@@ -58,14 +63,16 @@ async def run_stress_test_async(
         rpcpassword=rpcpassword,
         testnet=testnet,
         timeout=timeout,
-        async_mode=True
+        async_mode=True,
+        max_connections=concurrency
     )
     
     async with client:
         results = await client.stress_test(
             num_calls=num_calls,
             command=command,
-            concurrency=concurrency
+            concurrency=concurrency,
+            batch_size=batch_size
         )
     
     display_results(results)
@@ -80,7 +87,8 @@ def run_stress_test_sync(
     timeout: int = 30,
     num_calls: int = 100,
     command: str = "getblockcount",
-    concurrency: int = 10
+    concurrency: int = 10,
+    batch_size: int = 1
 ) -> Dict[str, Any]:
     """
     Run synchronous stress test with the specified parameters
@@ -95,6 +103,7 @@ def run_stress_test_sync(
         num_calls: Number of calls to make
         command: RPC command to execute
         concurrency: Concurrency level for test
+        batch_size: Number of calls to send per JSON-RPC batch request
         
     Returns:
         Dictionary with test results
@@ -108,14 +117,16 @@ def run_stress_test_sync(
         rpcpassword=rpcpassword,
         testnet=testnet,
         timeout=timeout,
-        async_mode=False
+        async_mode=False,
+        max_connections=concurrency
     )
     
     with client:
         results = client.stress_test(
             num_calls=num_calls,
             command=command,
-            concurrency=concurrency
+            concurrency=concurrency,
+            batch_size=batch_size
         )
     
     display_results(results)
@@ -131,6 +142,7 @@ def run_stress_test(
     num_calls: int = 100,
     command: str = "getblockcount",
     concurrency: int = 10,
+    batch_size: int = 1,
     async_mode: Optional[bool] = None
 ) -> Union[Dict[str, Any], asyncio.coroutine]:
     """
@@ -147,6 +159,7 @@ def run_stress_test(
         num_calls: Number of calls to make
         command: RPC command to execute
         concurrency: Concurrency level for test
+        batch_size: Number of calls to send per JSON-RPC batch request
         async_mode: Force async mode (True) or sync mode (False). If None, auto-detect.
         
     Returns:
@@ -160,31 +173,56 @@ def run_stress_test(
         rpcpassword=rpcpassword,
         testnet=testnet,
         timeout=timeout,
-        async_mode=async_mode
+        async_mode=async_mode,
+        max_connections=concurrency
     )
     
     # Use sync_or_async to automatically choose the right implementation
     return sync_or_async(
-        lambda: run_with_sync_client(client, num_calls, command, concurrency),
-        lambda: run_with_async_client(client, num_calls, command, concurrency)
+        lambda: run_with_sync_client(client, num_calls, command, concurrency, batch_size),
+        lambda: run_with_async_client(client, num_calls, command, concurrency, batch_size)
     )()
 
-def run_with_sync_client(client: EvrmoreClient, num_calls: int, command: str, concurrency: int) -> Dict[str, Any]:
+def run_with_sync_client(client: EvrmoreClient, num_calls: int, command: str, concurrency: int,
+                         batch_size: int = 1) -> Dict[str, Any]:
     """Run stress test with a synchronous client"""
     console.print(f"[bold green]Running auto-detected sync stress test with {num_calls} calls to {command}...[/]")
     with client:
-        results = client.stress_test(num_calls=num_calls, command=command, concurrency=concurrency)
+        results = client.stress_test(num_calls=num_calls, command=command, concurrency=concurrency,
+                                     batch_size=batch_size)
     display_results(results)
     return results
 
-async def run_with_async_client(client: EvrmoreClient, num_calls: int, command: str, concurrency: int) -> Dict[str, Any]:
+async def run_with_async_client(client: EvrmoreClient, num_calls: int, command: str, concurrency: int,
+                                batch_size: int = 1) -> Dict[str, Any]:
     """Run stress test with an asynchronous client"""
     console.print(f"[bold green]Running auto-detected async stress test with {num_calls} calls to {command}...[/]")
     async with client:
-        results = await client.stress_test(num_calls=num_calls, command=command, concurrency=concurrency)
+        results = await client.stress_test(num_calls=num_calls, command=command, concurrency=concurrency,
+                                           batch_size=batch_size)
     display_results(results)
     return results
 
+def _format_last_result(last_result: Any, limit: int = MAX_LAST_RESULT_LENGTH) -> str:
+    """
+    Format a result for display, truncated to at most limit characters.
+    
+    JSON is encoded incrementally so that large results (e.g. verbose blocks)
+    are not serialized in full just to be cut short.
+    """
+    if not isinstance(last_result, (dict, list)):
+        text = str(last_result)
+        return text if len(text) <= limit else text[:limit] + "…(truncated)"
+    
+    chunks = []
+    length = 0
+    for chunk in json.JSONEncoder(indent=2, default=str).iterencode(last_result):
+        chunks.append(chunk)
+        length += len(chunk)
+        if length > limit:
+            return "".join(chunks)[:limit] + "…(truncated)"
+    return "".join(chunks)
+
 def display_results(results: Dict[str, Any]) -> None:
     """Display test results in a nice table"""
     table = Table(title="Stress Test Results", box=box.ROUNDED)
@@ -192,23 +230,31 @@ def display_results(results: Dict[str, Any]) -> None:
     table.add_column("Metric", style="cyan")
     table.add_column("Value", style="green")
     
-    table.add_row("Total Time", f"{results['total_time']:.2f} seconds")
-    table.add_row("Requests Per Second", f"{results['requests_per_second']:.2f}")
-    table.add_row("Average Response Time", f"{results['avg_time']:.2f} ms")
-    table.add_row("Median Response Time", f"{results['median_time']:.2f} ms")
-    table.add_row("Min Response Time", f"{results['min_time']:.2f} ms")
-    table.add_row("Max Response Time", f"{results['max_time']:.2f} ms")
-    table.add_row("Number of Calls", str(results['num_calls']))
-    table.add_row("Concurrency", str(results['concurrency']))
-    
-    # Add last result in a readable format
-    last_result = results['last_result']
-    if isinstance(last_result, (dict, list)):
-        last_result = json.dumps(last_result, indent=2)
-    table.add_row("Last Result", str(last_result))
+    rows = [
+        ("Total Time", f"{results['total_time']:.2f} seconds"),
+        ("Requests Per Second", f"{results['requests_per_second']:.2f}"),
+        ("Average Response Time", f"{results['avg_time']:.2f} ms"),
+        ("Median Response Time", f"{results['median_time']:.2f} ms"),
+        ("Min Response Time", f"{results['min_time']:.2f} ms"),
+        ("Max Response Time", f"{results['max_time']:.2f} ms"),
+        ("Number of Calls", str(results['num_calls'])),
+        ("Concurrency", str(results['concurrency'])),
+        ("Batch Size", str(results.get('batch_size', 1))),
+        # Add last result in a readable format
+        ("Last Result", _format_last_result(results['last_result'])),
+    ]
+    for row in rows:
+        table.add_row(*row)
     
     console.print(table)
 
+def _positive_int(value: str) -> int:
+    """Parse a command-line integer that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
 async def _main_async():
     """Asynchronous command-line entry point"""
     parser = argparse.ArgumentParser(description="Stress test for evrmore-rpc client")
@@ -221,14 +267,14 @@ async def _main_async():
     parser.add_argument("--num-calls", type=int, default=100, help="Number of calls to make")
     parser.add_argument("--command", default="getblockcount", help="RPC command to execute")
     parser.add_argument("--concurrency", type=int, default=10, help="Concurrency level for test")
+    parser.add_argument("--batch-size", type=_positive_int, default=1, help="Number of calls per JSON-RPC batch request")
     parser.add_argument("--sync", action="store_true", help="Force synchronous mode")
     
     args = parser.parse_args()
     
     start_time = time.time()
     
-    # Use the run_stress_test function which auto-detects the context
-    result = run_stress_test(
+    options = dict(
         url=args.url,
         datadir=args.datadir,
         rpcuser=args.rpcuser,
@@ -238,12 +284,15 @@ async def _main_async():
         num_calls=args.num_calls,
         command=args.command,
         concurrency=args.concurrency,
-        async_mode=args.sync is False if args.sync else None
+        batch_size=args.batch_size
     )
     
-    # If we're in an async context and result is a coroutine, await it
-    if is_async_context() and asyncio.iscoroutine(result):
-        await result
+    # The mode is known here, so call the implementation directly
+    # rather than going through run_stress_test's context detection
+    if args.sync:
+        run_stress_test_sync(**options)
+    else:
+        await run_stress_test_async(**options)
     
     total_time = time.time() - start_time
     console.print(f"[bold]Total test time: {total_time:.2f} seconds[/]")
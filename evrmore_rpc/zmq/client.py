@@ -63,10 +63,10 @@ Dependencies:
 """
 
 import asyncio
-import binascii
 import enum
 import logging
 import socket
+import sys
 from typing import Any, Callable, Dict, List, Optional, Set, Union
 
 try:
@@ -81,6 +81,9 @@ from evrmore_rpc.zmq.models import ZMQNotification
 # Set up logging
 logger = logging.getLogger("evrmore_rpc.zmq")
 
+# Maximum number of queued messages handled before yielding to the event loop
+RECV_BATCH_SIZE = 1000
+
 
 class ZMQTopic(enum.Enum):
     """
@@ -101,15 +104,24 @@ class EvrmoreZMQClient:
     This class provides a simple interface for subscribing to ZMQ notifications
     from an Evrmore node and handling them with callback functions.
     
+    Topics listed in ``conflate_topics`` only ever have their most recent notification
+    pending: while that topic's handlers are busy, newer notifications replace the
+    queued one instead of piling up. This is only safe for idempotent handlers that
+    care about the latest value (e.g. "refresh on new block" from HASH_BLOCK), not
+    for handlers that must see every notification.
+    
     Attributes:
         zmq_host: The host of the Evrmore node's ZMQ interface.
         zmq_port: The port of the Evrmore node's ZMQ interface.
         topics: The ZMQ topics to subscribe to.
+        rcvhwm: The receive high water mark (maximum queued messages) of the socket.
+        conflate_topics: The ZMQ topics whose handlers only receive the latest notification.
         context: The ZMQ context.
         socket: The ZMQ socket.
     """
     
-    def __init__(self, zmq_host: str = "127.0.0.1", zmq_port: int = 28332, topics: Optional[List[ZMQTopic]] = None) -> None:
+    def __init__(self, zmq_host: str = "127.0.0.1", zmq_port: int = 28332, topics: Optional[List[ZMQTopic]] = None,
+                 rcvhwm: int = 100000, conflate_topics: Optional[Set[ZMQTopic]] = None) -> None:
         """
         Initialize the ZMQ client.
         
@@ -117,6 +129,10 @@ class EvrmoreZMQClient:
             zmq_host: The host of the Evrmore node's ZMQ interface.
             zmq_port: The port of the Evrmore node's ZMQ interface.
             topics: The ZMQ topics to subscribe to.
+            rcvhwm: The receive high water mark of the socket. ZMQ silently drops
+                messages beyond this many queued messages (the ZMQ default is 1000).
+            conflate_topics: The ZMQ topics for which only the latest pending
+                notification is dispatched.
         """
         if not HAS_ZMQ:
             logger.warning("ZMQ is not installed. ZMQ functionality will not be available.")
@@ -124,9 +140,20 @@ class EvrmoreZMQClient:
         self.zmq_host = zmq_host
         self.zmq_port = zmq_port
         self.topics = topics or list(ZMQTopic)
+        self.rcvhwm = rcvhwm
+        self.conflate_topics = set(conflate_topics or ())
         self.context = None
         self.socket = None
-        self.handlers: Dict[str, List[Callable]] = {}
+        self.handlers: Dict[bytes, List[Callable]] = {}
+        # Topic frames are decoded once here rather than for every message
+        self._topic_names: Dict[bytes, str] = {
+            topic.value: sys.intern(topic.value.decode("ascii")) for topic in ZMQTopic
+        }
+        # ZMQ_CONFLATE does not support multipart messages, so conflation is done
+        # here: the latest pending notification per topic and the task dispatching it
+        self._conflate: Set[bytes] = {topic.value for topic in self.conflate_topics}
+        self._latest: Dict[bytes, ZMQNotification] = {}
+        self._conflate_tasks: Dict[bytes, asyncio.Task] = {}
         self._running = False
         self._task = None
     
@@ -168,6 +195,8 @@ class EvrmoreZMQClient:
         # Set socket options
         # Note: We set a timeout to avoid blocking indefinitely
         self.socket.set(zmq.RCVTIMEO, 5000)  # 5 seconds
+        # Must be set before connecting to take effect
+        self.socket.setsockopt(zmq.RCVHWM, self.rcvhwm)
         
         # Connect to Evrmore node
         try:
@@ -203,6 +232,12 @@ class EvrmoreZMQClient:
                 await asyncio.gather(self._task, return_exceptions=True)
             except asyncio.CancelledError:
                 pass
+        
+        for task in self._conflate_tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._conflate_tasks.values(), return_exceptions=True)
+        self._conflate_tasks.clear()
+        self._latest.clear()
             
         # Close socket and context
         if self.socket:
@@ -213,6 +248,49 @@ class EvrmoreZMQClient:
             self.context.term()
             self.context = None
             
+    async def _safe_call(self, handler: Callable, notification: ZMQNotification) -> None:
+        """
+        Call a notification handler, logging any exception it raises.
+        
+        Args:
+            handler: The handler to call.
+            notification: The notification to pass to the handler.
+        """
+        try:
+            await handler(notification)
+        except Exception as e:
+            logger.error(f"Error in handler: {e}")
+    
+    async def _dispatch(self, topic: bytes, notification: ZMQNotification) -> None:
+        """
+        Dispatch a notification to the handlers registered for its topic.
+        
+        Handlers run concurrently so one slow handler (e.g. doing an RPC lookup)
+        does not hold up the others.
+        
+        Args:
+            topic: The raw topic frame of the notification.
+            notification: The notification to dispatch.
+        """
+        handlers = self.handlers.get(topic)
+        if not handlers:
+            return
+        if len(handlers) == 1:
+            # Usual case: no need to wrap the call in a gather
+            await self._safe_call(handlers[0], notification)
+        else:
+            await asyncio.gather(*(self._safe_call(handler, notification) for handler in handlers))
+    
+    async def _dispatch_latest(self, topic: bytes) -> None:
+        """
+        Dispatch the latest pending notification of a conflated topic until none is left.
+        
+        Args:
+            topic: The raw topic frame of the conflated topic.
+        """
+        while topic in self._latest:
+            await self._dispatch(topic, self._latest.pop(topic))
+    
     async def _receive_loop(self) -> None:
         """
         Background task for receiving ZMQ notifications.
@@ -220,31 +298,54 @@ class EvrmoreZMQClient:
         This method continuously receives notifications from the ZMQ socket
         and dispatches them to the appropriate handlers.
         """
+        # Frames are read from a synchronous shadow of the socket. Only waiting for
+        # the socket to become readable is awaited; the queued messages are then
+        # drained frame by frame, without a future or frame list per message.
+        receiver = zmq.Socket.shadow(self.socket.underlying)
+        
         while self._running:
             try:
-                # Receive message
-                msg = await self.socket.recv_multipart()
-                
-                # Parse message
-                topic, body, sequence = msg
-                sequence = int.from_bytes(sequence, byteorder="little")
-                hex_data = binascii.hexlify(body).decode("utf-8")
-                
-                # Create notification
-                notification = ZMQNotification(
-                    topic=topic.decode("utf-8"),
-                    body=body,
-                    sequence=sequence,
-                    hex=hex_data,
-                )
+                if not await self.socket.poll(timeout=5000, flags=zmq.POLLIN):
+                    # Timeout, just continue
+                    continue
                 
-                # Dispatch to handlers
-                if topic in self.handlers:
-                    for handler in self.handlers[topic]:
-                        try:
-                            await handler(notification)
-                        except Exception as e:
-                            logger.error(f"Error in handler: {e}")
+                for _ in range(RECV_BATCH_SIZE):
+                    # Receive message (topic, body and sequence frames)
+                    try:
+                        topic = receiver.recv(zmq.NOBLOCK)
+                    except zmq.error.Again:
+                        break
+                    # The rest of a multipart message is delivered together with its first frame
+                    if not receiver.rcvmore:
+                        continue
+                    body = receiver.recv()
+                    if not receiver.rcvmore:
+                        continue
+                    sequence = int.from_bytes(receiver.recv(), byteorder="little")
+                    
+                    topic_name = self._topic_names.get(topic)
+                    if topic_name is None:
+                        topic_name = topic.decode("utf-8")
+                    
+                    # Create notification (the hex form is computed lazily on access)
+                    notification = ZMQNotification(
+                        topic=topic_name,
+                        body=body,
+                        sequence=sequence,
+                    )
+                    
+                    # Dispatch to handlers (keyed by the raw topic frame)
+                    if topic in self._conflate:
+                        # Replace any pending notification; start a dispatcher if idle
+                        self._latest[topic] = notification
+                        task = self._conflate_tasks.get(topic)
+                        if task is None or task.done():
+                            self._conflate_tasks[topic] = asyncio.create_task(self._dispatch_latest(topic))
+                    else:
+                        await self._dispatch(topic, notification)
+                else:
+                    # Still more queued; let other tasks (e.g. conflated dispatchers) run
+                    await asyncio.sleep(0)
                             
             except zmq.error.Again:
                 # Timeout, just continue
@@ -7,6 +7,7 @@ These models ensure properly typed and structured data when working with ZMQ not
 
 from dataclasses import dataclass
 from datetime import datetime
+from functools import cached_property
 from typing import Optional
 
 
@@ -19,7 +20,7 @@ class ZMQNotification:
     - topic: The type of notification (e.g., 'hashblock', 'hashtx')
     - body: The binary data of the notification (e.g., block or transaction hash)
     - sequence: A sequence number for the notification
-    - hex: The hexadecimal representation of the binary data
+    - hex: The hexadecimal representation of the binary data, computed on first access
     
     The exact format of the body depends on the notification type:
     - HASH_BLOCK: 32-byte block hash
@@ -36,13 +37,22 @@ class ZMQNotification:
     topic: str
     body: bytes
     sequence: int
-    hex: str
     timestamp: datetime = None
     
     def __post_init__(self):
         if self.timestamp is None:
             self.timestamp = datetime.now()
 
+    @cached_property
+    def hex(self) -> str:
+        """
+        Hexadecimal representation of the binary data.
+        
+        Raw blocks can be megabytes in size, so the encoding is only done
+        (once) for handlers that actually use it.
+        """
+        return self.body.hex()
+
     def __repr__(self) -> str:
         """String representation of the notification."""
-        return f"ZMQNotification(topic='{self.topic}', hex='{self.hex[:16]}{'...' if len(self.hex) > 16 else ''}', sequence={self.sequence})" 
\ No newline at end of file
+        return f"ZMQNotification(topic='{self.topic}', hex='{self.body[:8].hex()}{'...' if len(self.body) > 8 else ''}', sequence={self.sequence})" 
\ No newline at end of file
@@ -10,12 +10,17 @@ This example demonstrates how to:
 
 Requirements:
     - Evrmore node with RPC enabled
+    - Evrmore node with ZMQ block notifications enabled:
+      zmqpubhashblock=tcp://127.0.0.1:28332
     - evrmore-rpc package installed
 """
 
 import asyncio
+import heapq
 import signal
+from collections import Counter, OrderedDict, deque
 from datetime import datetime
+from itertools import islice
 from decimal import Decimal
 from typing import Dict, Set, List, Optional
 from dataclasses import dataclass
@@ -25,7 +30,7 @@ from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
 from rich.prompt import Prompt
-from evrmore_rpc import EvrmoreClient
+from evrmore_rpc import get_default_client
 from evrmore_rpc.zmq.client import EvrmoreZMQClient, ZMQTopic
 from evrmore_rpc.zmq.models import ZMQNotification
 
@@ -45,8 +50,8 @@ class AssetActivity:
 
 # Global state
 state = {
-    'assets': {},  # Asset name -> {supply, holders, reissuable, etc.}
-    'activities': [],  # List of recent asset activities
+    'assets': {},  # Asset name -> {supply, holders (address -> balance in sats), reissuable, etc.}
+    'activities': deque(maxlen=100),  # Recent asset activities, oldest dropped first
     'start_time': datetime.now(),
     'issue_count': 0,
     'transfer_count': 0,
@@ -55,125 +60,195 @@ state = {
     'last_block': 0,
 }
 
-# RPC client
-rpc = EvrmoreClient()
-# Force sync mode
-rpc.force_sync()
+# Smallest asset unit per whole asset, for integer holder balances
+COIN = 100_000_000
+
+# Maximum number of previous transactions fetched per batch request
+MAX_BATCH_TXS = 100
+
+# Outputs of previous transactions, keyed by txid. Mined transactions never
+# change, so these are kept across blocks (least recently used evicted first).
+PREV_TX_CACHE_SIZE = 50_000
+prev_tx_cache: "OrderedDict[str, list]" = OrderedDict()
+
+# Top assets by holder count, or None when stale. Assets only change when a block
+# is processed, so this is recomputed once per block rather than per redraw. It is
+# cleared after every block rather than keyed on height, as a reorg replaces a
+# block without raising the height.
+_top_assets_cache: Optional[List] = None
+
+# RPC client, decoding amounts straight to Decimal
+# Async mode, since RPCs are made from ZMQ handlers on the event loop
+rpc = get_default_client(use_decimal=True, async_mode=True)
 
 def format_amount(amount: Decimal) -> str:
     """Format amount with proper precision."""
     return f"{amount:,.8f}"
 
+async def fetch_prev_txs(txids: Set[str]) -> None:
+    """Load the outputs of the given previous transactions into the cache."""
+    missing = [txid for txid in txids if txid not in prev_tx_cache]
+    # Batch requests instead of one round-trip per input, in chunks so that each
+    # stays well within the request timeout. A transaction that can't be fetched
+    # is left out of the cache, failing only the inputs that spend it.
+    for chunk_start in range(0, len(missing), MAX_BATCH_TXS):
+        chunk = missing[chunk_start:chunk_start + MAX_BATCH_TXS]
+        prev_txs = await rpc.batch_call(
+            [("getrawtransaction", [txid, True]) for txid in chunk],
+            return_exceptions=True
+        )
+        for txid, prev_tx in zip(chunk, prev_txs):
+            if not isinstance(prev_tx, Exception):
+                prev_tx_cache[txid] = prev_tx['vout']
+    
+    for txid in txids:
+        if txid in prev_tx_cache:
+            prev_tx_cache.move_to_end(txid)
+    while len(prev_tx_cache) > max(PREV_TX_CACHE_SIZE, len(txids)):
+        prev_tx_cache.popitem(last=False)
+
+def _process_tx(tx: dict, block_time: datetime, activities: List[AssetActivity]) -> None:
+    """
+    Update asset state from a single transaction and record its activities.
+    
+    This is the per-transaction hot loop of process_block. It does no I/O:
+    previous outputs must already be in prev_tx_cache.
+    """
+    assets = state['assets']
+    
+    # Track input addresses and amounts
+    input_assets: Dict[str, Dict[str, int]] = {}  # asset -> {address -> amount in sats}
+    for vin in tx['vin']:
+        if 'coinbase' in vin:
+            continue
+        
+        try:
+            # Get previous output
+            script = prev_tx_cache[vin['txid']][vin['vout']].get('scriptPubKey', {})
+            
+            # Check for asset transfer
+            asset_info = script.get('asset')
+            if asset_info is not None:
+                addresses = script.get('addresses')
+                from_address = addresses[0] if addresses else "unknown"
+                
+                by_address = input_assets.setdefault(asset_info['name'], {})
+                by_address[from_address] = by_address.get(from_address, 0) + int(asset_info['amount'] * COIN)
+        except Exception as e:
+            console.print(f"[red]Error processing input: {e}[/red]")
+            continue
+    
+    # Track output addresses and amounts
+    txid = tx['txid']
+    for vout in tx['vout']:
+        try:
+            script = vout.get('scriptPubKey', {})
+            asset_info = script.get('asset')
+            if asset_info is None:
+                continue
+            
+            asset_name = asset_info['name']
+            amount = asset_info['amount']
+            addresses = script.get('addresses')
+            to_address = addresses[0] if addresses else "unknown"
+            
+            # Determine activity type
+            asset = assets.get(asset_name)
+            if asset is None:
+                # New asset issuance
+                activity_type = 'issue'
+                state['issue_count'] += 1
+                from_address = None
+                asset = assets[asset_name] = {
+                    'supply': amount,
+                    'holders': Counter({to_address: int(amount * COIN)}),
+                    'reissuable': asset_info.get('reissuable', False),
+                    'ipfs_hash': asset_info.get('ipfs_hash'),
+                    'first_seen': block_time,
+                    'last_updated': block_time,
+                }
+            elif asset_name in input_assets:
+                # Asset transfer
+                activity_type = 'transfer'
+                state['transfer_count'] += 1
+                from_address = next(iter(input_assets[asset_name]))
+                asset['holders'][to_address] += int(amount * COIN)
+            else:
+                # Asset reissuance
+                activity_type = 'reissue'
+                state['reissue_count'] += 1
+                from_address = None
+                asset['supply'] += amount
+                asset['holders'][to_address] += int(amount * COIN)
+            
+            # Record activity
+            activities.append(AssetActivity(
+                asset_name=asset_name,
+                activity_type=activity_type,
+                amount=amount,
+                from_address=from_address,
+                to_address=to_address,
+                txid=txid,
+                timestamp=block_time
+            ))
+            
+            # Update asset state
+            asset['last_updated'] = block_time
+        except Exception as e:
+            console.print(f"[red]Error processing output: {e}[/red]")
+            continue
+    
+    # Debit the spent inputs; change outputs were credited back above
+    for asset_name, by_address in input_assets.items():
+        asset = assets.get(asset_name)
+        if asset is None:
+            continue
+        holders = asset['holders']
+        for from_address, sats in by_address.items():
+            holders[from_address] -= sats
+            # Balances from before monitoring started are unknown, so may go negative
+            if holders[from_address] <= 0:
+                del holders[from_address]
+
 async def process_block(block_hash: str) -> List[AssetActivity]:
     """Process a block for asset activities."""
+    global _top_assets_cache
+    
     activities = []
     try:
         # Get block data
-        block = rpc.getblock(block_hash, 2)  # Verbose level 2 for full tx data
+        block = await rpc.getblock(block_hash, 2)  # Verbose level 2 for full tx data
         block_time = datetime.fromtimestamp(block['time'])
         
+        # Fetch every previous transaction spent in this block up front
+        prev_txids = {
+            vin['txid']
+            for tx in block['tx']
+            for vin in tx['vin']
+            if 'coinbase' not in vin
+        }
+        try:
+            await fetch_prev_txs(prev_txids)
+        except Exception as e:
+            console.print(f"[red]Error fetching previous transactions: {e}[/red]")
+        
         # Process each transaction
         for tx in block['tx']:
-            # Track input addresses and amounts
-            input_assets = {}  # asset -> {address -> amount}
-            for vin in tx['vin']:
-                if 'coinbase' in vin:
-                    continue
-                
-                try:
-                    # Get previous transaction
-                    prev_tx = rpc.getrawtransaction(vin['txid'], True)
-                    prev_out = prev_tx['vout'][vin['vout']]
-                    
-                    # Check for asset transfer
-                    if 'asset' in prev_out.get('scriptPubKey', {}):
-                        asset_info = prev_out['scriptPubKey']['asset']
-                        asset_name = asset_info['name']
-                        amount = Decimal(str(asset_info['amount']))
-                        if 'addresses' in prev_out['scriptPubKey'] and prev_out['scriptPubKey']['addresses']:
-                            from_address = prev_out['scriptPubKey']['addresses'][0]
-                        else:
-                            from_address = "unknown"
-                        
-                        if asset_name not in input_assets:
-                            input_assets[asset_name] = {}
-                        if from_address not in input_assets[asset_name]:
-                            input_assets[asset_name][from_address] = Decimal('0')
-                        input_assets[asset_name][from_address] += amount
-                except Exception as e:
-                    console.print(f"[red]Error processing input: {e}[/red]")
-                    continue
-            
-            # Track output addresses and amounts
-            for vout in tx['vout']:
-                try:
-                    if 'asset' not in vout.get('scriptPubKey', {}):
-                        continue
-                        
-                    asset_info = vout['scriptPubKey']['asset']
-                    asset_name = asset_info['name']
-                    amount = Decimal(str(asset_info['amount']))
-                    
-                    if 'addresses' in vout['scriptPubKey'] and vout['scriptPubKey']['addresses']:
-                        to_address = vout['scriptPubKey']['addresses'][0]
-                    else:
-                        to_address = "unknown"
-                    
-                    # Determine activity type
-                    if asset_name not in state['assets']:
-                        # New asset issuance
-                        activity_type = 'issue'
-                        state['issue_count'] += 1
-                        from_address = None
-                        state['assets'][asset_name] = {
-                            'supply': amount,
-                            'holders': {to_address},
-                            'reissuable': asset_info.get('reissuable', False),
-                            'ipfs_hash': asset_info.get('ipfs_hash'),
-                            'first_seen': block_time,
-                            'last_updated': block_time,
-                        }
-                    elif asset_name in input_assets:
-                        # Asset transfer
-                        activity_type = 'transfer'
-                        state['transfer_count'] += 1
-                        from_address = next(iter(input_assets[asset_name].keys()))
-                        state['assets'][asset_name]['holders'].add(to_address)
-                        if from_address in state['assets'][asset_name]['holders']:
-                            input_amount = input_assets[asset_name][from_address]
-                            if input_amount <= amount:
-                                state['assets'][asset_name]['holders'].remove(from_address)
-                    else:
-                        # Asset reissuance
-                        activity_type = 'reissue'
-                        state['reissue_count'] += 1
-                        from_address = None
-                        state['assets'][asset_name]['supply'] += amount
-                        state['assets'][asset_name]['holders'].add(to_address)
-                        
-                    # Record activity
-                    activities.append(AssetActivity(
-                        asset_name=asset_name,
-                        activity_type=activity_type,
-                        amount=amount,
-                        from_address=from_address,
-                        to_address=to_address,
-                        txid=tx['txid'],
-                        timestamp=block_time
-                    ))
-                    
-                    # Update asset state
-                    state['assets'][asset_name]['last_updated'] = block_time
-                except Exception as e:
-                    console.print(f"[red]Error processing output: {e}[/red]")
-                    continue
+            _process_tx(tx, block_time, activities)
+        
+        state['last_block'] = max(state['last_block'], block['height'])
     except Exception as e:
         console.print(f"[red]Error processing block: {e}[/red]")
+    finally:
+        # Even a partly processed block may have changed the assets
+        _top_assets_cache = None
     
     return activities
 
 def create_stats_table() -> Table:
     """Create a table showing current asset statistics."""
+    global _top_assets_cache
+    
     table = Table(title="Asset Monitor")
     
     table.add_column("Metric", style="cyan")
@@ -210,7 +285,7 @@ def create_stats_table() -> Table:
     # Add recent activities
     if state['activities']:
         table.add_row("Recent Activities", "", "")
-        for activity in reversed(state['activities'][-5:]):
+        for activity in islice(reversed(state['activities']), 5):
             if activity.activity_type == 'issue':
                 details = f"Initial supply: {format_amount(activity.amount)}"
             elif activity.activity_type == 'transfer':
@@ -231,11 +306,13 @@ def create_stats_table() -> Table:
             )
     
     # Add top assets by holder count
-    top_assets = sorted(
-        state['assets'].items(),
-        key=lambda x: len(x[1]['holders']),
-        reverse=True
-    )[:5]
+    if _top_assets_cache is None:
+        _top_assets_cache = heapq.nlargest(
+            5,
+            state['assets'].items(),
+            key=lambda x: len(x[1]['holders'])
+        )
+    top_assets = _top_assets_cache
     
     if top_assets:
         table.add_row("Top Assets by Holders", "", "")
@@ -251,42 +328,38 @@ def create_stats_table() -> Table:
 async def monitor() -> None:
     """Main monitoring function."""
     # Get initial blockchain info
-    chain_info = rpc.getblockchaininfo()
+    chain_info = await rpc.getblockchaininfo()
     state['last_block'] = chain_info['blocks']
     
+    # New blocks are pushed by the node instead of polled for
+    zmq_client = EvrmoreZMQClient(topics=[ZMQTopic.HASH_BLOCK])
+    
+    @zmq_client.on(ZMQTopic.HASH_BLOCK)
+    async def on_block(notification: ZMQNotification) -> None:
+        console.print(f"[green]New block detected: {notification.hex}[/green]")
+        activities = await process_block(notification.hex)
+        
+        # Update state
+        state['activities'].extend(activities)
+    
     # Start monitoring
     with Live(create_stats_table(), refresh_per_second=4) as live:
-        while True:
-            try:
-                # Check for new blocks
-                current_height = rpc.getblockcount()
-                
-                if current_height > state['last_block']:
-                    console.print(f"[green]New block detected: {current_height}[/green]")
-                    
-                    # Process new blocks
-                    for height in range(state['last_block'] + 1, current_height + 1):
-                        block_hash = rpc.getblockhash(height)
-                        activities = await process_block(block_hash)
-                        
-                        # Update state
-                        state['activities'].extend(activities)
-                        if len(state['activities']) > 100:
-                            state['activities'] = state['activities'][-100:]
-                        
-                        state['last_block'] = height
-                
-                # Update display
+        async def refresh_display() -> None:
+            while True:
                 live.update(create_stats_table())
-                
-                # Sleep to avoid excessive polling
-                await asyncio.sleep(2)
-                
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                console.print(f"[red]Error: {e}[/red]")
-                await asyncio.sleep(5)  # Wait longer after an error
+                await asyncio.sleep(0.25)
+        
+        refresh_task = asyncio.create_task(refresh_display())
+        await zmq_client.start()
+        try:
+            # Block handling happens in on_block; wait until cancelled
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            refresh_task.cancel()
+            await zmq_client.stop()
+            await rpc.close()
 
 async def main():
     """Main entry point."""
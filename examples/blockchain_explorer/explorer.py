@@ -15,8 +15,11 @@ Requirements:
 
 import asyncio
 import signal
+from collections import deque
 from datetime import datetime
 from decimal import Decimal
+from itertools import islice
+from typing import Dict, List, Optional
 from rich.console import Console
 from rich.live import Live
 from rich.table import Table
@@ -24,7 +27,7 @@ from rich.panel import Panel
 from rich.text import Text
 from rich.prompt import Prompt
 from rich.progress import Progress
-from evrmore_rpc import EvrmoreClient
+from evrmore_rpc import get_default_client
 from evrmore_rpc.zmq.client import EvrmoreZMQClient, ZMQTopic
 from evrmore_rpc.zmq.models import ZMQNotification
 
@@ -33,34 +36,31 @@ console = Console()
 
 # Global state
 state = {
-    'latest_blocks': [],  # Keep track of last 10 blocks
-    'latest_txs': [],     # Keep track of last 10 transactions
+    'latest_blocks': deque(maxlen=10),  # Keep track of last 10 blocks, newest first
+    'latest_txs': deque(maxlen=10),     # Keep track of last 10 transactions, newest first
     'start_time': datetime.now(),
     'block_count': 0,
     'tx_count': 0,
     'last_block': 0,
 }
 
-# RPC client
-rpc = EvrmoreClient()
-# Force sync mode
-rpc.force_sync()
+# Maximum number of blocks fetched in one batch request
+MAX_BATCH_BLOCKS = 50
+
+# RPC client, decoding amounts straight to Decimal
+# Async mode so RPCs don't block the event loop
+rpc = get_default_client(use_decimal=True, async_mode=True)
 
 def format_amount(amount: Decimal) -> str:
     """Format EVR amount with proper precision."""
     return f"{amount:,.8f} EVR"
 
-async def get_block_info(block_hash: str) -> dict:
-    """Get detailed block information."""
-    block = rpc.getblock(block_hash, 2)  # Verbose output with tx details
-    
+def summarize_block(block: dict, coinbase_tx: dict) -> dict:
+    """Summarize a block fetched with verbosity 1, given its decoded coinbase transaction."""
     # Calculate block reward
     reward = Decimal('0')
-    for tx in block['tx']:
-        if 'vin' not in tx or not tx['vin'] or 'coinbase' not in tx['vin'][0]:
-            continue
-        for vout in tx['vout']:
-            reward += Decimal(str(vout['value']))
+    for vout in coinbase_tx['vout']:
+        reward += vout['value']
     
     return {
         'hash': block['hash'],
@@ -69,15 +69,21 @@ async def get_block_info(block_hash: str) -> dict:
         'transactions': len(block['tx']),
         'size': block['size'],
         'weight': block.get('weight', 0),
-        'difficulty': Decimal(str(block['difficulty'])),
+        'difficulty': block['difficulty'],
         'reward': reward,
-        'tx_ids': [tx['txid'] for tx in block['tx'][:10]],  # Just store first 10 txids
+        'tx_ids': block['tx'][:10],  # Just store first 10 txids
+        # Table row, formatted once instead of on every render
+        'row': (
+            f"Block {block['height']}",
+            block['hash'][:8] + "...",
+            f"Txs: {len(block['tx'])}, "
+            f"Size: {block['size']} bytes, "
+            f"Reward: {format_amount(reward)}"
+        ),
     }
 
-async def get_transaction_info(txid: str) -> dict:
-    """Get detailed transaction information."""
-    tx = rpc.getrawtransaction(txid, True)
-    
+def summarize_transaction(tx: dict, prev_txs: Dict[str, dict], block_time: int) -> dict:
+    """Summarize a decoded transaction, given the previous transactions it spends."""
     # Calculate total input/output values
     total_in = Decimal('0')
     total_out = Decimal('0')
@@ -86,38 +92,60 @@ async def get_transaction_info(txid: str) -> dict:
         if 'coinbase' in vin:
             continue
         try:
-            prev_tx = rpc.getrawtransaction(vin['txid'], True)
-            total_in += Decimal(str(prev_tx['vout'][vin['vout']]['value']))
+            prev_tx = prev_txs[vin['txid']]
+            total_in += prev_tx['vout'][vin['vout']]['value']
         except Exception as e:
             console.print(f"[yellow]Warning getting input value: {e}[/yellow]")
     
     for vout in tx.get('vout', []):
-        total_out += Decimal(str(vout['value']))
-    
-    # Get block time for transaction
-    block_hash = tx.get('blockhash')
-    if block_hash:
-        block_time = tx.get('blocktime', 0)
-        if not block_time:
-            try:
-                block = rpc.getblock(block_hash, 1)
-                block_time = block['time']
-            except:
-                block_time = int(datetime.now().timestamp())
-    else:
-        # For mempool transactions, use current time
-        block_time = int(datetime.now().timestamp())
+        total_out += vout['value']
     
+    fee = total_in - total_out if total_in > 0 else Decimal('0')
     return {
         'txid': tx['txid'],
         'size': tx.get('size', 0),
         'time': datetime.fromtimestamp(block_time),
         'total_input': total_in,
         'total_output': total_out,
-        'fee': total_in - total_out if total_in > 0 else Decimal('0'),
+        'fee': fee,
         'confirmations': tx.get('confirmations', 0),
+        # Table row, formatted once instead of on every render (the
+        # confirmations are a snapshot taken when the transaction was fetched)
+        'row': (
+            tx['txid'][:8] + "...",
+            format_amount(total_out),
+            f"Fee: {format_amount(fee)}, "
+            f"Confs: {tx.get('confirmations', 0)}"
+        ),
     }
 
+async def fetch_prev_txs(txs: List[dict], prev_tx_cache: Optional[Dict[str, dict]] = None) -> Dict[str, dict]:
+    """
+    Fetch the previous transactions spent by the given transactions.
+    
+    Transactions already in prev_tx_cache are not fetched again; the rest are
+    fetched once each, in a single batch request, and added to the cache.
+    
+    Returns:
+        The cache, mapping txid to decoded transaction
+    """
+    if prev_tx_cache is None:
+        prev_tx_cache = {}
+    
+    missing = list({
+        vin['txid']
+        for tx in txs
+        for vin in tx.get('vin', [])
+        if 'coinbase' not in vin and vin['txid'] not in prev_tx_cache
+    })
+    if missing:
+        try:
+            results = await rpc.batch_call([("getrawtransaction", [txid, True]) for txid in missing])
+            prev_tx_cache.update(zip(missing, results))
+        except Exception as e:
+            console.print(f"[yellow]Warning getting input values: {e}[/yellow]")
+    return prev_tx_cache
+
 def create_stats_table() -> Table:
     """Create a table showing current blockchain statistics."""
     table = Table(title="Blockchain Explorer")
@@ -151,63 +179,97 @@ def create_stats_table() -> Table:
     # Add latest blocks
     if state['latest_blocks']:
         table.add_row("Latest Blocks", "", "")
-        for block in state['latest_blocks'][:5]:
-            table.add_row(
-                f"Block {block['height']}",
-                block['hash'][:8] + "...",
-                f"Txs: {block['transactions']}, "
-                f"Size: {block['size']} bytes, "
-                f"Reward: {format_amount(block['reward'])}"
-            )
+        for block in islice(state['latest_blocks'], 5):
+            table.add_row(*block['row'])
     
     # Add latest transactions
     if state['latest_txs']:
         table.add_row("Latest Transactions", "", "")
-        for tx in state['latest_txs'][:5]:
-            table.add_row(
-                tx['txid'][:8] + "...",
-                format_amount(tx['total_output']),
-                f"Fee: {format_amount(tx['fee'])}, "
-                f"Confs: {tx['confirmations']}"
-            )
+        for tx in islice(state['latest_txs'], 5):
+            table.add_row(*tx['row'])
     
     return table
 
-async def process_new_blocks(start_height: int, end_height: int) -> None:
-    """Process new blocks from start_height to end_height (inclusive)."""
-    for height in range(start_height, end_height + 1):
+async def produce_blocks(start_height: int, end_height: int, queue: asyncio.Queue) -> None:
+    """Fetch blocks in chunks and queue them, followed by None once done or on error."""
+    for chunk_start in range(start_height, end_height + 1, MAX_BATCH_BLOCKS):
+        chunk_end = min(chunk_start + MAX_BATCH_BLOCKS - 1, end_height)
         try:
-            # Get block hash
-            block_hash = rpc.getblockhash(height)
-            
-            # Get detailed block info
-            block = await get_block_info(block_hash)
-            state['latest_blocks'].insert(0, block)
-            state['block_count'] += 1
-            
-            # Process transactions in the block
-            for txid in block['tx_ids']:
-                tx = await get_transaction_info(txid)
-                state['latest_txs'].insert(0, tx)
-                state['tx_count'] += 1
+            # One batch request per step instead of one round-trip per block
+            block_hashes = await rpc.batch_call([
+                ("getblockhash", [height]) for height in range(chunk_start, chunk_end + 1)
+            ])
+            # Header and txids only, rather than every decoded transaction
+            blocks = await rpc.batch_call([("getblock", [block_hash, 1]) for block_hash in block_hashes])
+        except Exception as e:
+            console.print(f"[red]Error processing blocks {chunk_start} to {chunk_end}: {e}[/red]")
+            break
+        await queue.put(blocks)
+    await queue.put(None)
+
+async def consume_blocks(queue: asyncio.Queue) -> None:
+    """Decode the transactions of queued blocks and add them to the state, in order."""
+    while True:
+        blocks = await queue.get()
+        if blocks is None:
+            return
+        
+        try:
+            # The first 10 transactions of each block are listed, but only the
+            # newest ones stay in latest_txs, so only those are decoded along with
+            # each block's coinbase (for the reward)
+            listed = [txid for block in blocks for txid in block['tx'][:10]]
+            newest = listed[-state['latest_txs'].maxlen:]
+            detailed = set(newest)
+            needed = list(dict.fromkeys([block['tx'][0] for block in blocks] + newest))
+            decoded = dict(zip(needed, await rpc.batch_call([
+                ("getrawtransaction", [txid, True]) for txid in needed
+            ])))
             
-            # Keep only last 10 blocks and transactions
-            if len(state['latest_blocks']) > 10:
-                state['latest_blocks'] = state['latest_blocks'][:10]
+            # Inputs often spend transactions decoded from earlier blocks in the
+            # same range, which are already at hand, so only the rest are fetched
+            prev_txs = dict(decoded)
+            await fetch_prev_txs([decoded[txid] for txid in newest], prev_txs)
+        except Exception as e:
+            console.print(f"[red]Error processing blocks {blocks[0]['height']} to {blocks[-1]['height']}: {e}[/red]")
+            return
+        
+        for block in blocks:
+            try:
+                # Get detailed block info
+                block_info = summarize_block(block, decoded[block['tx'][0]])
+                state['latest_blocks'].appendleft(block_info)
+                state['block_count'] += 1
                 
-            if len(state['latest_txs']) > 10:
-                state['latest_txs'] = state['latest_txs'][:10]
+                # Process transactions in the block
+                for txid in block['tx'][:10]:
+                    if txid in detailed:
+                        tx_info = summarize_transaction(decoded[txid], prev_txs, block['time'])
+                        state['latest_txs'].appendleft(tx_info)
+                    state['tx_count'] += 1
                 
-            # Update last processed block
-            state['last_block'] = height
-            
-        except Exception as e:
-            console.print(f"[red]Error processing block {height}: {e}[/red]")
+                # Update last processed block
+                state['last_block'] = block['height']
+                
+            except Exception as e:
+                console.print(f"[red]Error processing block {block.get('height')}: {e}[/red]")
+
+async def process_new_blocks(start_height: int, end_height: int) -> None:
+    """Process new blocks from start_height to end_height (inclusive)."""
+    # The next chunk of blocks is fetched while the transactions of the
+    # current one are decoded; the small queue bounds how far ahead it gets
+    queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+    producer = asyncio.create_task(produce_blocks(start_height, end_height, queue))
+    try:
+        await consume_blocks(queue)
+    finally:
+        # Stops the producer if the consumer gave up early
+        producer.cancel()
 
 async def explorer() -> None:
     """Main explorer function."""
     # Get initial blockchain info
-    chain_info = rpc.getblockchaininfo()
+    chain_info = await rpc.getblockchaininfo()
     state['last_block'] = chain_info['blocks'] - 10  # Start 10 blocks back
     if state['last_block'] < 0:
         state['last_block'] = 0
@@ -217,27 +279,39 @@ async def explorer() -> None:
     await process_new_blocks(state['last_block'] + 1, current_height)
     
     # Create live display
-    with Live(create_stats_table(), refresh_per_second=4) as live:
-        while True:
-            try:
-                # Check for new blocks
-                current_height = rpc.getblockcount()
-                
-                if current_height > state['last_block']:
-                    console.print(f"[green]New blocks detected: {state['last_block'] + 1} to {current_height}[/green]")
-                    await process_new_blocks(state['last_block'] + 1, current_height)
-                
-                # Update display
-                live.update(create_stats_table())
-                
-                # Sleep to avoid excessive polling
-                await asyncio.sleep(2)
-                
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                console.print(f"[red]Error: {e}[/red]")
-                await asyncio.sleep(5)  # Wait longer after an error
+    with Live(create_stats_table(), refresh_per_second=1) as live:
+        async def refresh_display() -> None:
+            # Only rebuild the table when there is something new to show
+            last_rendered_counts = (state['block_count'], state['tx_count'])
+            while True:
+                await asyncio.sleep(1)
+                counts = (state['block_count'], state['tx_count'])
+                if counts != last_rendered_counts:
+                    live.update(create_stats_table())
+                    last_rendered_counts = counts
+        
+        refresh_task = asyncio.create_task(refresh_display())
+        try:
+            while True:
+                try:
+                    # Check for new blocks
+                    current_height = await rpc.getblockcount()
+                    
+                    if current_height > state['last_block']:
+                        console.print(f"[green]New blocks detected: {state['last_block'] + 1} to {current_height}[/green]")
+                        await process_new_blocks(state['last_block'] + 1, current_height)
+                    
+                    # Sleep to avoid excessive polling
+                    await asyncio.sleep(2)
+                    
+                except asyncio.CancelledError:
+                    break
+                except Exception as e:
+                    console.print(f"[red]Error: {e}[/red]")
+                    await asyncio.sleep(5)  # Wait longer after an error
+        finally:
+            refresh_task.cancel()
+            await rpc.close()
 
 async def main():
     """Main entry point."""
@@ -29,7 +29,7 @@ from rich.panel import Panel
 from rich.text import Text
 from rich.progress import Progress, BarColumn, TextColumn
 from rich.prompt import Prompt
-from evrmore_rpc import EvrmoreClient
+from evrmore_rpc import get_default_client
 from evrmore_rpc.zmq.client import EvrmoreZMQClient, ZMQTopic
 from evrmore_rpc.zmq.models import ZMQNotification
 
@@ -79,7 +79,8 @@ state = {
 }
 
 # RPC client
-rpc = EvrmoreClient()
+# Async mode so RPCs run on the event loop instead of worker threads
+rpc = get_default_client(async_mode=True)
 
 def format_size(size: int) -> str:
     """Format size in bytes to human readable format."""
@@ -96,23 +97,20 @@ def format_speed(bytes_per_sec: float) -> str:
 async def get_network_stats() -> NetworkStats:
     """Get current network statistics."""
     try:
-        # Get peer info
-        peers = await asyncio.to_thread(rpc.getpeerinfo)
+        # Get peer info, network totals, banned list and uptime concurrently
+        peers, net_totals, banned, uptime = await asyncio.gather(
+            rpc.getpeerinfo(),
+            rpc.getnettotals(),
+            rpc.listbanned(),
+            rpc.uptime(),
+        )
+        
         peers_dict = [dict(p) for p in peers]  # Convert to dictionaries
         inbound = sum(1 for p in peers_dict if p.get('inbound', False))
         outbound = len(peers_dict) - inbound
-        
-        # Get network totals
-        net_totals = await asyncio.to_thread(rpc.getnettotals)
         net_totals_dict = dict(net_totals)  # Convert to dictionary
-        
-        # Get banned list
-        banned = await asyncio.to_thread(rpc.listbanned)
         banned_dict = [dict(b) for b in banned]  # Convert to dictionary
         
-        # Get uptime
-        uptime = await asyncio.to_thread(rpc.uptime)
-        
         return NetworkStats(
             connections=len(peers_dict),
             inbound=inbound,
@@ -139,7 +137,7 @@ async def get_network_stats() -> NetworkStats:
 async def update_peer_info() -> None:
     """Update peer information."""
     try:
-        peers = await asyncio.to_thread(rpc.getpeerinfo)
+        peers = await rpc.getpeerinfo()
         peers_dict = [dict(p) for p in peers]  # Convert to dictionaries
         now = datetime.now()
         
@@ -179,7 +177,7 @@ async def update_peer_info() -> None:
         
         # Update banned addresses
         try:
-            banned = await asyncio.to_thread(rpc.listbanned)
+            banned = await rpc.listbanned()
             banned_dict = [dict(b) for b in banned]  # Convert to dictionary
             state['banned'] = {b.get('address', '') for b in banned_dict if b.get('address')}
         except Exception as e:
@@ -313,6 +311,7 @@ async def monitor() -> None:
             await zmq_task
         except asyncio.CancelledError:
             pass
+    await rpc.close()
 
 async def main():
     """Main entry point."""
@@ -28,7 +28,7 @@ from rich.panel import Panel
 from rich.text import Text
 from rich.prompt import Prompt
 from rich.progress import Progress, SpinnerColumn, TextColumn
-from evrmore_rpc import EvrmoreClient
+from evrmore_rpc import get_default_client
 
 # Rich console for pretty output
 console = Console()
@@ -65,7 +65,7 @@ state = {
 }
 
 # RPC client
-rpc = EvrmoreClient()
+rpc = get_default_client()
 
 def format_amount(amount: Decimal, asset: Optional[str] = None) -> str:
     """Format amount with proper precision."""
@@ -10,6 +10,8 @@ This example demonstrates how to:
 
 Requirements:
     - Evrmore node with RPC enabled
+    - Evrmore node with ZMQ block notifications enabled:
+      zmqpubhashblock=tcp://127.0.0.1:28332
     - evrmore-rpc package installed
 """
 
@@ -28,7 +30,7 @@ from rich.panel import Panel
 from rich.text import Text
 from rich.prompt import Prompt
 from rich.traceback import install
-from evrmore_rpc import EvrmoreClient
+from evrmore_rpc import get_default_client
 from evrmore_rpc.zmq.client import EvrmoreZMQClient, ZMQTopic
 from evrmore_rpc.zmq.models import ZMQNotification
 
@@ -65,13 +67,15 @@ state = {
     'tx_count': 0,
     'assets': {},  # Asset name -> {balance, metadata}
     'addresses': [],  # List of wallet addresses
-    'last_block': 0,
+    'last_block_hash': None,  # Cursor for listsinceblock
 }
 
-# RPC client
-rpc = EvrmoreClient()
-# Force sync mode
-rpc.force_sync()
+# Seconds between full refreshes, in case a block notification was missed
+FULL_REFRESH_INTERVAL = 60
+
+# RPC client, decoding amounts straight to Decimal
+# Async mode so RPCs don't block the event loop
+rpc = get_default_client(use_decimal=True, async_mode=True)
 
 def format_amount(amount: Decimal, asset: Optional[str] = None) -> str:
     """Format amount with proper precision."""
@@ -80,57 +84,76 @@ def format_amount(amount: Decimal, asset: Optional[str] = None) -> str:
         formatted += f" {asset}"
     return formatted
 
-async def get_wallet_balance() -> Balance:
-    """Get current wallet balance."""
-    # Get EVR balance
-    balance_info = rpc.getbalance("*", 0, True)  # Include unconfirmed
-    confirmed = rpc.getbalance("*", 1, True)     # Only confirmed
-    
+def parse_balance(balance_info, confirmed, my_assets: Dict) -> Balance:
+    """Build a balance object from getbalance and listmyassets results."""
     # Get asset balances
     assets = {}
-    my_assets = rpc.listmyassets()
     for asset, amount in my_assets.items():
         if isinstance(amount, (int, float, Decimal)):
-            assets[asset] = Decimal(str(amount))
+            assets[asset] = amount
         elif isinstance(amount, dict) and 'balance' in amount:
-            assets[asset] = Decimal(str(amount['balance']))
+            assets[asset] = amount['balance']
     
     # Create balance object
     return Balance(
-        total=Decimal(str(balance_info)),
-        available=Decimal(str(confirmed)),
-        pending=Decimal(str(balance_info)) - Decimal(str(confirmed)),
+        total=balance_info,
+        available=confirmed,
+        pending=balance_info - confirmed,
         assets=assets,
         last_updated=datetime.now(),
     )
 
+async def get_wallet_balance() -> Balance:
+    """Get current wallet balance."""
+    # Get EVR and asset balances concurrently
+    balance_info, confirmed, my_assets = await asyncio.gather(
+        rpc.getbalance("*", 0, True),  # Include unconfirmed
+        rpc.getbalance("*", 1, True),  # Only confirmed
+        rpc.listmyassets(),
+    )
+    return parse_balance(balance_info, confirmed, my_assets)
+
+def parse_transaction(tx: Dict, now_ts: float) -> Transaction:
+    """Build a transaction object from a listtransactions/listsinceblock entry.
+    
+    now_ts is used as the timestamp of entries without a time.
+    """
+    # Extract asset information
+    assets = {}
+    if 'asset' in tx and tx['asset']:
+        if isinstance(tx['asset'], dict):
+            for asset, info in tx['asset'].items():
+                assets[asset] = info.get('amount', 0)
+    
+    # Create transaction object
+    return Transaction(
+        txid=tx['txid'],
+        type=tx['category'],
+        amount=tx.get('amount', 0),
+        fee=tx.get('fee', 0) if 'fee' in tx else None,
+        confirmations=tx.get('confirmations', 0),
+        timestamp=datetime.fromtimestamp(tx.get('time', now_ts)),
+        address=tx.get('address'),
+        category=tx.get('category', ''),
+        assets=assets,
+    )
+
 async def get_transactions(count: int = 20) -> List[Transaction]:
     """Get recent transactions."""
-    tx_list = rpc.listtransactions("*", count)
-    transactions = []
-    
-    for tx in tx_list:
-        # Extract asset information
-        assets = {}
-        if 'asset' in tx and tx['asset']:
-            if isinstance(tx['asset'], dict):
-                for asset, info in tx['asset'].items():
-                    assets[asset] = Decimal(str(info.get('amount', 0)))
-        
-        # Create transaction object
-        transactions.append(Transaction(
-            txid=tx['txid'],
-            type=tx['category'],
-            amount=Decimal(str(tx.get('amount', 0))),
-            fee=Decimal(str(tx.get('fee', 0))) if 'fee' in tx else None,
-            confirmations=tx.get('confirmations', 0),
-            timestamp=datetime.fromtimestamp(tx.get('time', time.time())),
-            address=tx.get('address'),
-            category=tx.get('category', ''),
-            assets=assets,
-        ))
+    tx_list = await rpc.listtransactions("*", count)
+    now_ts = time.time()
+    return [parse_transaction(tx, now_ts) for tx in tx_list]
+
+def merge_transactions(new_transactions: List[Transaction], count: int = 20) -> None:
+    """Merge new or updated transactions into the recent transaction history."""
+    # Entries are per output, so the same txid can appear more than once;
+    # newer entries replace older ones to pick up confirmation changes
+    merged = {(tx.txid, tx.category, tx.address): tx for tx in state['transactions']}
+    for tx in new_transactions:
+        merged[(tx.txid, tx.category, tx.address)] = tx
     
-    return transactions
+    # Keep the most recent entries, oldest first like listtransactions
+    state['transactions'] = sorted(merged.values(), key=lambda tx: tx.timestamp)[-count:]
 
 def create_stats_table() -> Table:
     """Create a table showing wallet statistics."""
@@ -201,45 +224,52 @@ def create_stats_table() -> Table:
     
     return table
 
+async def update_assets() -> None:
+    """Update asset balances, fetching metadata only for newly seen assets."""
+    if state['balance'] and state['balance'].assets:
+        now = datetime.now()
+        
+        # Try to get asset data for newly seen assets, all at once
+        new_assets = [asset for asset in state['balance'].assets if asset not in state['assets']]
+        asset_data = await asyncio.gather(
+            *(rpc.getassetdata(asset) for asset in new_assets),
+            return_exceptions=True
+        )
+        for asset, metadata in zip(new_assets, asset_data):
+            state['assets'][asset] = {
+                'balance': state['balance'].assets[asset],
+                'metadata': {} if isinstance(metadata, Exception) else metadata,
+                'last_updated': now,
+            }
+        
+        for asset, amount in state['balance'].assets.items():
+            state['assets'][asset]['balance'] = amount
+            state['assets'][asset]['last_updated'] = now
+
 async def update_state() -> None:
     """Update global state."""
     try:
-        # Update balance
-        state['balance'] = await get_wallet_balance()
+        # Take the cursor first so a block arriving mid-refresh is picked up
+        # by the next listsinceblock rather than missed
+        state['last_block_hash'] = await rpc.getbestblockhash()
         
-        # Update transactions
-        state['transactions'] = await get_transactions()
+        # Update balance and transactions
+        state['balance'], state['transactions'] = await asyncio.gather(
+            get_wallet_balance(),
+            get_transactions(),
+        )
         
         # Update asset information
-        if state['balance'] and state['balance'].assets:
-            for asset, amount in state['balance'].assets.items():
-                if asset not in state['assets']:
-                    # Try to get asset data
-                    try:
-                        asset_data = rpc.getassetdata(asset)
-                        state['assets'][asset] = {
-                            'balance': amount,
-                            'metadata': asset_data,
-                            'last_updated': datetime.now(),
-                        }
-                    except:
-                        state['assets'][asset] = {
-                            'balance': amount,
-                            'metadata': {},
-                            'last_updated': datetime.now(),
-                        }
-                else:
-                    state['assets'][asset]['balance'] = amount
-                    state['assets'][asset]['last_updated'] = datetime.now()
+        await update_assets()
         
         # Update addresses - try different methods as they vary by wallet version
         try:
             # Try newer wallet method
-            state['addresses'] = list(rpc.getaddressesbylabel(""))
+            state['addresses'] = list(await rpc.getaddressesbylabel(""))
         except:
             try:
                 # Try older wallet method
-                state['addresses'] = rpc.getaddressesbyaccount("")
+                state['addresses'] = await rpc.getaddressesbyaccount("")
             except:
                 # If both fail, just use an empty list
                 state['addresses'] = []
@@ -247,29 +277,79 @@ async def update_state() -> None:
     except Exception as e:
         console.print(f"[red]Error updating state: {e}[/red]")
 
+async def update_since_last_block() -> None:
+    """Apply wallet changes since the last seen block to the global state."""
+    if state['last_block_hash'] is None:
+        await update_state()
+        return
+    
+    try:
+        # Fetch the diff and the new balances in a single request
+        since, balance_info, confirmed, my_assets = await rpc.batch_call([
+            ("listsinceblock", [state['last_block_hash']]),
+            ("getbalance", ["*", 0, True]),  # Include unconfirmed
+            ("getbalance", ["*", 1, True]),  # Only confirmed
+            ("listmyassets", []),
+        ])
+        
+        state['balance'] = parse_balance(balance_info, confirmed, my_assets)
+        now_ts = time.time()
+        merge_transactions([parse_transaction(tx, now_ts) for tx in since['transactions']])
+        state['last_block_hash'] = since['lastblock']
+        
+        # Update asset information
+        await update_assets()
+        
+    except Exception as e:
+        console.print(f"[red]Error updating state: {e}[/red]")
+
 async def tracker() -> None:
     """Main tracking function."""
     # Initialize state
     await update_state()
+    last_full_refresh = time.monotonic()
+    
+    # Wallet changes are driven by block notifications instead of polling
+    zmq_client = EvrmoreZMQClient(topics=[ZMQTopic.HASH_BLOCK])
+    new_block = asyncio.Event()
+    
+    @zmq_client.on(ZMQTopic.HASH_BLOCK)
+    async def on_block(notification: ZMQNotification) -> None:
+        # Blocks arriving during an update are coalesced into one diff
+        new_block.set()
     
     # Create live display
     with Live(create_stats_table(), refresh_per_second=1) as live:
-        while True:
-            try:
-                # Update state
-                await update_state()
-                
-                # Update display
-                live.update(create_stats_table())
-                
-                # Sleep to avoid excessive polling
-                await asyncio.sleep(5)
-                
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                console.print(f"[red]Error: {e}[/red]")
-                await asyncio.sleep(10)  # Wait longer after an error
+        await zmq_client.start()
+        try:
+            while True:
+                try:
+                    # Wake on a new block, or every few seconds to redraw
+                    try:
+                        await asyncio.wait_for(new_block.wait(), timeout=5)
+                    except asyncio.TimeoutError:
+                        pass
+                    
+                    # Update state
+                    if new_block.is_set():
+                        new_block.clear()
+                        await update_since_last_block()
+                    # Reconcile periodically even when blocks keep arriving
+                    if time.monotonic() - last_full_refresh >= FULL_REFRESH_INTERVAL:
+                        await update_state()
+                        last_full_refresh = time.monotonic()
+                    
+                    # Update display
+                    live.update(create_stats_table())
+                    
+                except asyncio.CancelledError:
+                    break
+                except Exception as e:
+                    console.print(f"[red]Error: {e}[/red]")
+                    await asyncio.sleep(10)  # Wait longer after an error
+        finally:
+            await zmq_client.stop()
+            await rpc.close()
 
 async def main():
     """Main entry point."""
@@ -20,10 +20,13 @@ Requirements:
 """
 
 import asyncio
+import hashlib
 import signal
+import struct
 import time
 from datetime import datetime
-from typing import Dict, Set, List, Optional
+from decimal import Decimal
+from typing import Any, Dict, Set, List, Optional, Tuple
 import binascii
 
 # Import the ZMQ client and topic enum
@@ -49,9 +52,25 @@ stats = {
 # Important: We'll initialize it properly in main()
 rpc_client = None
 
+# Coalesces RPC calls from notification handlers, also created in main()
+batcher = None
+
+# Background asset checks, kept referenced until they finish
+pending_checks: Set[asyncio.Task] = set()
+
 # Flag to control the main loop
 running = True
 
+# Script constants for locally parsing asset outputs
+OP_PUSHDATA1 = 0x4c
+OP_EVR_ASSET = 0xc0
+ASSET_MARKER = b'evr'
+ASSET_TYPE_OWNER = ord('o')
+COIN = 100_000_000
+
+# Evrmore block headers include the ProgPoW height, nonce and mix hash
+BLOCK_HEADER_SIZE = 120
+
 def format_time_ago(timestamp: Optional[float]) -> str:
     """Format how long ago an event occurred."""
     if timestamp is None:
@@ -82,14 +101,166 @@ def print_stats() -> None:
     print(f"Asset transactions: {len(stats['asset_txs'])}")
     print("================================\n")
 
+class RPCBatcher:
+    """
+    Coalesce RPC calls into JSON-RPC batch requests.
+    
+    Calls made within flush_interval seconds of each other (and while a previous
+    batch is in flight) are sent together, so during a burst of notifications the
+    number of RPC requests is bounded by the flush rate rather than the tx rate.
+    """
+    
+    def __init__(self, client: EvrmoreClient, flush_interval: float = 0.05, max_batch_size: int = 500):
+        self.client = client
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self) -> None:
+        """Start flushing queued calls in the background."""
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop flushing queued calls."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+    
+    async def call(self, method: str, *params: Any) -> Any:
+        """Queue an RPC call and wait for its result."""
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((method, list(params), future))
+        return await future
+    
+    async def _run(self) -> None:
+        while True:
+            # Wait for a first call, then collect whatever arrives within the window
+            pending = [await self.queue.get()]
+            await asyncio.sleep(self.flush_interval)
+            while len(pending) < self.max_batch_size and not self.queue.empty():
+                pending.append(self.queue.get_nowait())
+            
+            try:
+                results = await self.client.batch_call(
+                    [(method, params) for method, params, _ in pending],
+                    return_exceptions=True
+                )
+            except Exception as e:
+                results = [e] * len(pending)
+            
+            for (_, _, future), result in zip(pending, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+def read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    """Read a variable length integer, returning it and the offset after it."""
+    prefix = data[offset]
+    if prefix < 0xfd:
+        return prefix, offset + 1
+    size = {0xfd: 2, 0xfe: 4, 0xff: 8}[prefix]
+    return int.from_bytes(data[offset + 1:offset + 1 + size], 'little'), offset + 1 + size
+
+def parse_raw_transaction(data: bytes, offset: int = 0) -> Tuple[str, List[bytes], int]:
+    """
+    Parse a serialized transaction without asking the node to decode it.
+    
+    Args:
+        data: Buffer containing the serialized transaction.
+        offset: Offset of the transaction in the buffer.
+        
+    Returns:
+        The txid, the scriptPubKey of each output, and the offset after the transaction.
+    """
+    start = offset
+    offset += 4  # version
+    
+    # Segwit serialization has a 0x00 marker and 0x01 flag after the version
+    segwit = data[offset] == 0 and data[offset + 1] == 1
+    if segwit:
+        offset += 2
+    body_start = offset
+    
+    num_inputs, offset = read_varint(data, offset)
+    for _ in range(num_inputs):
+        offset += 36  # previous txid and vout
+        script_len, offset = read_varint(data, offset)
+        offset += script_len + 4  # script and sequence
+    
+    num_outputs, offset = read_varint(data, offset)
+    scripts = []
+    for _ in range(num_outputs):
+        offset += 8  # value
+        script_len, offset = read_varint(data, offset)
+        scripts.append(data[offset:offset + script_len])
+        offset += script_len
+    body_end = offset
+    
+    if segwit:
+        for _ in range(num_inputs):
+            num_items, offset = read_varint(data, offset)
+            for _ in range(num_items):
+                item_len, offset = read_varint(data, offset)
+                offset += item_len
+    offset += 4  # locktime
+    
+    # The txid commits to the serialization without witness data
+    stripped = data[start:start + 4] + data[body_start:body_end] + data[offset - 4:offset]
+    txid = hashlib.sha256(hashlib.sha256(stripped).digest()).digest()[::-1].hex()
+    return txid, scripts, offset
+
+def parse_asset_script(script: bytes) -> Optional[Tuple[str, Decimal]]:
+    """
+    Extract the asset name and amount from an asset output script.
+    
+    Args:
+        script: The scriptPubKey of an output.
+        
+    Returns:
+        The asset name and amount, or None if the output carries no asset.
+    """
+    # Asset data follows a P2PKH (25 byte) or P2SH (23 byte) script
+    for index in (25, 23):
+        if len(script) > index + 6 and script[index] == OP_EVR_ASSET:
+            data = index + (3 if script[index + 1] == OP_PUSHDATA1 else 2)
+            if script[data:data + 3] == ASSET_MARKER:
+                break
+    else:
+        return None
+    
+    asset_type = script[data + 3]
+    name_len = script[data + 4]
+    name_end = data + 5 + name_len
+    name = script[data + 5:name_end].decode('ascii', errors='replace')
+    if asset_type == ASSET_TYPE_OWNER:
+        return name, Decimal(1)
+    amount, = struct.unpack_from('<q', script, name_end)
+    return name, Decimal(amount) / COIN
+
+def find_asset_outputs(raw_tx: bytes, offset: int = 0) -> Tuple[str, List[Tuple[str, Decimal]], int]:
+    """Parse a serialized transaction and return its txid, asset outputs and end offset."""
+    start = offset
+    txid, scripts, offset = parse_raw_transaction(raw_tx, offset)
+    
+    # Most transactions carry no assets, and bytes.find scans for the marker in C
+    if raw_tx.find(ASSET_MARKER, start, offset) == -1:
+        return txid, [], offset
+    
+    assets = [asset for asset in map(parse_asset_script, scripts) if asset]
+    return txid, assets, offset
+
 async def check_for_assets(tx_hash: bytes) -> None:
     """Check if a transaction involves assets using RPC."""
-    global rpc_client
-    
     try:
-        # Get the transaction details
-        tx_hex = await rpc_client.getrawtransaction(tx_hash.hex())
-        tx_data = await rpc_client.decoderawtransaction(tx_hex)
+        # Get the decoded transaction in one call (batched with other notifications' lookups)
+        tx_data = await batcher.call("getrawtransaction", tx_hash.hex(), True)
         
         # Check if any outputs involve assets
         for output in tx_data.get('vout', []):
@@ -105,12 +276,14 @@ async def check_for_assets(tx_hash: bytes) -> None:
         print(f"Error checking transaction for assets: {e}")
 
 async def main():
-    global running, rpc_client
+    global running, rpc_client, batcher
     
     # Initialize the RPC client in async mode
     rpc_client = EvrmoreClient()
     # Force the client into async mode since we'll use it in async context
     rpc_client.force_async()
+    batcher = RPCBatcher(rpc_client)
+    batcher.start()
     
     # Create a ZMQ client
     zmq_client = EvrmoreZMQClient(
@@ -147,24 +320,51 @@ async def main():
         stats['latest_tx_hash'] = notification.body
         print(f"New transaction: {notification.hex}")
         
-        # Check if this transaction involves assets
-        await check_for_assets(notification.body)
+        # Raw transactions are checked for assets locally in handle_raw_transaction
+        if ZMQTopic.RAW_TX in zmq_client.topics:
+            return
+        
+        # Otherwise ask the node. This runs in the background so the next
+        # notifications are received, and their lookups batched, meanwhile.
+        task = asyncio.create_task(check_for_assets(notification.body))
+        pending_checks.add(task)
+        task.add_done_callback(pending_checks.discard)
     
     # Register a handler for raw blocks (full block data)
     @zmq_client.on(ZMQTopic.RAW_BLOCK)
     async def handle_raw_block(notification: ZMQNotification) -> None:
-        # This handler receives the full serialized block
-        # Processing this data requires low-level deserialization
-        # Just print the size for demonstration purposes
-        print(f"Raw block received: {len(notification.body)} bytes")
+        # This handler receives the full serialized block, which is parsed
+        # locally instead of asking the node to decode it
+        block = notification.body
+        try:
+            num_txs, offset = read_varint(block, BLOCK_HEADER_SIZE)
+            asset_txs = 0
+            for _ in range(num_txs):
+                _, assets, offset = find_asset_outputs(block, offset)
+                asset_txs += bool(assets)
+        except (IndexError, KeyError, struct.error) as e:
+            print(f"Error parsing raw block: {e}")
+            return
+        print(f"Raw block received: {len(block)} bytes, {num_txs} transactions, {asset_txs} with assets")
     
     # Register a handler for raw transactions (full transaction data)
     @zmq_client.on(ZMQTopic.RAW_TX)
     async def handle_raw_transaction(notification: ZMQNotification) -> None:
-        # This handler receives the full serialized transaction
-        # Processing this data requires low-level deserialization
-        # Just print the size for demonstration purposes
-        print(f"Raw transaction received: {len(notification.body)} bytes")
+        # This handler receives the full serialized transaction, which is parsed
+        # locally instead of asking the node to decode it
+        if ASSET_MARKER not in notification.body:
+            return
+        
+        try:
+            txid, assets, _ = find_asset_outputs(notification.body)
+        except (IndexError, KeyError, struct.error) as e:
+            print(f"Error parsing raw transaction: {e}")
+            return
+        
+        if assets:
+            stats['asset_txs'].add(txid)
+            for asset_name, asset_amount in assets:
+                print(f"Asset transaction detected: {asset_name} = {asset_amount}")
     
     # Setup signal handlers for clean shutdown
     def signal_handler():
@@ -195,6 +395,9 @@ async def main():
     # Clean shutdown
     print("Stopping ZMQ client...")
     await zmq_client.stop()
+    for task in pending_checks:
+        task.cancel()
+    await batcher.stop()
     await rpc_client.close()
     print("ZMQ client stopped")
 
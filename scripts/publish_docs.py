@@ -29,6 +29,9 @@ Supported Documentation Platforms:
 """
 
 import argparse
+import functools
+import hashlib
+import importlib.util
 import os
 import subprocess
 import sys
@@ -37,32 +40,127 @@ import json
 import http.client
 import urllib.parse
 from pathlib import Path
+from shutil import rmtree, which
 from typing import List, Tuple, Dict, Any, Optional
 
+# TOML parser (tomllib is only in the standard library from Python 3.11)
+try:
+    import tomllib
+    HAS_TOMLLIB = True
+except ImportError:
+    try:
+        import tomli as tomllib
+        HAS_TOMLLIB = True
+    except ImportError:
+        HAS_TOMLLIB = False
+
+# Build and twine are used in process when installed, instead of with python3 -m
+try:
+    from build import ProjectBuilder
+    from build.env import DefaultIsolatedEnv
+    HAS_BUILD = True
+except ImportError:
+    HAS_BUILD = False
+
+try:
+    from twine.commands.upload import upload as twine_upload
+    from twine.settings import Settings as TwineSettings
+    HAS_TWINE = True
+except ImportError:
+    HAS_TWINE = False
+
 # Get the project root directory
 ROOT_DIR = Path(__file__).resolve().parent.parent
 
-def run_command(cmd, description, dry_run=False):
-    """Run a shell command and print the output."""
-    print(f"\n=== {description} ===")
+# Files holding the version, and the patterns matching it in each
+PYPROJECT_PATH = ROOT_DIR / "pyproject.toml"
+INIT_PATH = ROOT_DIR / "evrmore_rpc" / "__init__.py"
+# Anchored to the start of a line so that keys such as python_version don't match
+PYPROJECT_VERSION_RE = re.compile(r'^(version\s*=\s*)"([^"]+)"', re.MULTILINE)
+INIT_VERSION_RE = re.compile(r'(__version__\s*=\s*)"([^"]+)"')
+# Pre-release markers, which keep a version from becoming the default docs version
+PRERELEASE_RE = re.compile(r'(a|b|rc|dev)')
+# Owner and repository in SSH (git@github.com:owner/repo.git) and HTTPS remote URLs
+GITHUB_SSH_RE = re.compile(r'github\.com:([^/]+)/([^/]+?)(?:\.git)?$')
+GITHUB_HTTPS_RE = re.compile(r'github\.com/([^/]+)/([^/]+?)(?:\.git)?$')
+
+# Fingerprint of the sources the distributions in dist/ were last built from
+DIST_DIR = ROOT_DIR / "dist"
+BUILD_STAMP_PATH = DIST_DIR / ".build_stamp"
+# Paths shipped in the sdist, as in [tool.hatch.build.targets.sdist] of pyproject.toml
+DEFAULT_SDIST_INCLUDES = ["/evrmore_rpc", "/tests", "CHANGELOG.md", "LICENSE", "MANIFEST.in", "README.md"]
+
+# Cache of which tools are installed, keyed by (name, is_module)
+_tool_available: Dict[Tuple[str, bool], bool] = {}
+
+def tool_available(name, module=False):
+    """
+    Check whether a command line tool is installed, without running it.
+    
+    With module=True, check for an importable Python module instead (for tools
+    run with python3 -m). Each tool is only looked up once.
+    """
+    key = (name, module)
+    if key not in _tool_available:
+        if module:
+            _tool_available[key] = importlib.util.find_spec(name) is not None
+        else:
+            _tool_available[key] = which(name) is not None
+    return _tool_available[key]
+
+@functools.lru_cache(maxsize=None)
+def resolve_executable(name):
+    """Resolve a command name to its full path, or return it unchanged if not found."""
+    return which(name) or name
+
+def spawn(cmd, **kwargs):
+    """
+    Run a command with subprocess.run, letting CPython start it with posix_spawn.
+    
+    subprocess only uses posix_spawn instead of fork and exec when the executable
+    is given as a path and close_fds is False. Python's own file descriptors are
+    not inheritable, so not closing them in the child is safe.
+    """
+    return subprocess.run([resolve_executable(cmd[0]), *cmd[1:]], close_fds=False, **kwargs)
+
+def run_command(cmd, description, dry_run=False, capture=False):
+    """
+    Run a shell command.
+    
+    By default the command inherits stdout and stderr, so its output streams
+    straight to the terminal and large outputs (build, mkdocs) are neither
+    buffered in memory nor copied through Python.
+    
+    Args:
+        cmd: Command and arguments to run
+        description: Header printed before running the command
+        dry_run: Print the command instead of running it
+        capture: Capture the command's stdout and return it instead of streaming it
+        
+    Returns:
+        Tuple of (success, captured stdout, or "" when not capturing)
+    """
+    print(f"\n=== {description} ===", flush=True)
     if dry_run:
         print(f"[DRY RUN] Would execute: {' '.join(cmd)}")
         return True, ""
     
     try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        print(result.stdout)
-        return True, result.stdout
+        if capture:
+            result = spawn(cmd, check=True, capture_output=True, text=True)
+            return True, result.stdout
+        spawn(cmd, check=True)
+        return True, ""
     except subprocess.CalledProcessError as e:
         print(f"Error: {e}")
-        print(f"Output: {e.stdout}")
-        print(f"Error output: {e.stderr}")
-        return False, e.stderr
+        if e.stderr:
+            print(e.stderr)
+        return False, ""
 
 def get_current_branch():
     """Get the current Git branch name."""
     try:
-        result = subprocess.run(
+        result = spawn(
             ["git", "branch", "--show-current"], 
             check=True, 
             capture_output=True, 
@@ -76,7 +174,7 @@ def get_current_branch():
 def check_uncommitted_changes():
     """Check if there are uncommitted changes in the repository."""
     try:
-        result = subprocess.run(
+        result = spawn(
             ["git", "status", "--porcelain"],
             check=True,
             capture_output=True,
@@ -87,25 +185,39 @@ def check_uncommitted_changes():
         # Assume there are changes if we can't determine
         return True
 
+@functools.lru_cache(maxsize=None)
+def read_file(path):
+    """Read a file, or return None if it doesn't exist. Cached until write_file."""
+    if not path.exists():
+        return None
+    return path.read_text(encoding="utf-8")
+
+def write_file(path, content):
+    """Write a file and drop the cached content derived from it."""
+    path.write_text(content, encoding="utf-8")
+    read_file.cache_clear()
+    get_current_version.cache_clear()
+
+@functools.lru_cache(maxsize=None)
 def get_current_version():
     """Get the current version from pyproject.toml or __init__.py."""
-    # Try from pyproject.toml first
-    pyproject_path = ROOT_DIR / "pyproject.toml"
-    if pyproject_path.exists():
-        with open(pyproject_path, "r") as f:
-            content = f.read()
-            match = re.search(r'version\s*=\s*"([^"]+)"', content)
+    # Try from pyproject.toml first, parsed properly when a TOML parser is available
+    if HAS_TOMLLIB:
+        content = read_file(PYPROJECT_PATH)
+        if content is not None:
+            data = tomllib.loads(content)
+            version = data.get("project", {}).get("version") or \
+                data.get("tool", {}).get("poetry", {}).get("version")
+            if version:
+                return version
+    
+    # Otherwise match the version in pyproject.toml, then in __init__.py
+    for path, pattern in ((PYPROJECT_PATH, PYPROJECT_VERSION_RE), (INIT_PATH, INIT_VERSION_RE)):
+        content = read_file(path)
+        if content is not None:
+            match = pattern.search(content)
             if match:
-                return match.group(1)
-    
-    # Try from __init__.py
-    init_path = ROOT_DIR / "evrmore_rpc" / "__init__.py"
-    if init_path.exists():
-        with open(init_path, "r") as f:
-            content = f.read()
-            match = re.search(r'__version__\s*=\s*"([^"]+)"', content)
-            if match:
-                return match.group(1)
+                return match.group(2)
     
     return None
 
@@ -113,61 +225,145 @@ def update_version(version):
     """Update version in pyproject.toml and __init__.py."""
     files_updated = []
     
-    # Update pyproject.toml
-    pyproject_path = ROOT_DIR / "pyproject.toml"
-    if pyproject_path.exists():
-        with open(pyproject_path, "r") as f:
-            content = f.read()
-        
-        new_content = re.sub(r'(version\s*=\s*)"([^"]+)"', f'\\1"{version}"', content)
-        
-        if new_content != content:
-            with open(pyproject_path, "w") as f:
-                f.write(new_content)
-            files_updated.append(str(pyproject_path))
-    
-    # Update __init__.py
-    init_path = ROOT_DIR / "evrmore_rpc" / "__init__.py"
-    if init_path.exists():
-        with open(init_path, "r") as f:
-            content = f.read()
-        
-        new_content = re.sub(r'(__version__\s*=\s*)"([^"]+)"', f'\\1"{version}"', content)
+    for path, pattern in ((PYPROJECT_PATH, PYPROJECT_VERSION_RE), (INIT_PATH, INIT_VERSION_RE)):
+        content = read_file(path)
+        if content is None:
+            continue
         
+        # Only write files whose version actually changes
+        new_content = pattern.sub(f'\\1"{version}"', content, count=1)
         if new_content != content:
-            with open(init_path, "w") as f:
-                f.write(new_content)
-            files_updated.append(str(init_path))
+            write_file(path, new_content)
+            files_updated.append(str(path))
     
     return files_updated
 
-def build_and_publish_pypi(dry_run=False):
-    """Build and publish the package to PyPI."""
-    # Clean old builds
-    success, _ = run_command(
-        ["python3", "setup.py", "clean", "--all"],
-        "Cleaning old builds",
-        dry_run
-    )
-    if not success:
+def build_distributions(dry_run=False):
+    """Build the sdist and wheel into dist/, in process if build is installed."""
+    if not HAS_BUILD:
+        success, _ = run_command(
+            ["python3", "-m", "build"],
+            "Building distribution packages",
+            dry_run
+        )
+        return success
+    
+    print("\n=== Building distribution packages ===", flush=True)
+    if dry_run:
+        print("[DRY RUN] Would build sdist and wheel into dist/")
+        return True
+    
+    try:
+        with DefaultIsolatedEnv() as env:
+            builder = ProjectBuilder.from_isolated_env(env, ROOT_DIR)
+            env.install(builder.build_system_requires)
+            for distribution in ("sdist", "wheel"):
+                env.install(builder.get_requires_for_build(distribution))
+                print(f"Built {builder.build(distribution, DIST_DIR)}")
+        return True
+    except Exception as e:
+        print(f"Error: {e}")
         return False
+
+def upload_distributions(dry_run=False):
+    """Upload the distributions in dist/ to PyPI, in process if twine is installed."""
+    if not HAS_TWINE:
+        success, _ = run_command(
+            ["python3", "-m", "twine", "upload", "dist/*"],
+            "Uploading to PyPI",
+            dry_run
+        )
+        return success
     
-    # Create distribution packages
-    success, _ = run_command(
-        ["python3", "-m", "build"],
-        "Building distribution packages",
-        dry_run
-    )
-    if not success:
+    print("\n=== Uploading to PyPI ===", flush=True)
+    if dry_run:
+        print("[DRY RUN] Would upload dist/* to PyPI")
+        return True
+    
+    try:
+        twine_upload(TwineSettings(), [str(DIST_DIR / "*")])
+        return True
+    except Exception as e:
+        print(f"Error: {e}")
         return False
+
+def clean_builds(dry_run=False):
+    """Remove build/, dist/ and *.egg-info/ from the project root."""
+    print("\n=== Cleaning old builds ===", flush=True)
+    paths = [ROOT_DIR / "build", DIST_DIR, *ROOT_DIR.glob("*.egg-info")]
+    if dry_run:
+        print(f"[DRY RUN] Would remove: {', '.join(path.name for path in paths)}")
+        return
     
-    # Upload to PyPI
-    success, _ = run_command(
-        ["python3", "-m", "twine", "upload", "dist/*"],
-        "Uploading to PyPI",
-        dry_run
+    for path in paths:
+        rmtree(path, ignore_errors=True)
+
+def sdist_includes():
+    """
+    Get the paths shipped in the sdist.
+    
+    Read from [tool.hatch.build.targets.sdist] in pyproject.toml when a TOML
+    parser is available, otherwise DEFAULT_SDIST_INCLUDES.
+    
+    Returns:
+        List[Path]: Files and directories included in the sdist
+    """
+    includes = DEFAULT_SDIST_INCLUDES
+    content = read_file(PYPROJECT_PATH)
+    if HAS_TOMLLIB and content is not None:
+        sdist = tomllib.loads(content).get("tool", {}).get("hatch", {}).get("build", {}) \
+            .get("targets", {}).get("sdist", {})
+        includes = sdist.get("include", includes)
+    return [ROOT_DIR / include.lstrip("/") for include in includes]
+
+def source_fingerprint():
+    """Hash everything the distributions are built from.
+    
+    Returns:
+        str: SHA-256 hex digest over pyproject.toml and every file in the sdist
+    """
+    digest = hashlib.sha256()
+    paths = {PYPROJECT_PATH}
+    for include in sdist_includes():
+        if include.is_dir():
+            paths.update(
+                path for path in include.rglob("*")
+                if path.is_file() and "__pycache__" not in path.parts
+            )
+        elif include.is_file():
+            paths.add(include)
+    for path in sorted(paths):
+        digest.update(str(path.relative_to(ROOT_DIR)).encode())
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+def build_and_publish_pypi(dry_run=False):
+    """Build and publish the package to PyPI."""
+    # Skip the clean and build when dist/ was built from the current sources
+    fingerprint = source_fingerprint()
+    up_to_date = (
+        BUILD_STAMP_PATH.exists()
+        and BUILD_STAMP_PATH.read_text(encoding="utf-8") == fingerprint
+        and any(DIST_DIR.glob("*.whl"))
+        and any(DIST_DIR.glob("*.tar.gz"))
     )
-    if not success:
+    if up_to_date:
+        print("\n=== Distribution packages are up to date, skipping build ===")
+    else:
+        # Clean old builds
+        clean_builds(dry_run)
+        
+        # Create distribution packages
+        if not build_distributions(dry_run):
+            return False
+        
+        if not dry_run:
+            BUILD_STAMP_PATH.write_text(fingerprint, encoding="utf-8")
+    
+    # Upload to PyPI
+    if not upload_distributions(dry_run):
         return False
     
     return True
@@ -200,6 +396,25 @@ def build_and_publish_github_pages(use_github_actions=False, dry_run=False):
     
     return True
 
+def publish_github_pages(version, use_github_actions, versioned_docs, dry_run=False):
+    """Publish to GitHub Pages, then versioned documentation if requested."""
+    if use_github_actions:
+        # Trigger GitHub Actions workflow
+        if not trigger_github_actions_workflow(dry_run):
+            print("Warning: Failed to trigger GitHub Actions workflow")
+            print("Documentation will still be built on next push to main branch")
+    else:
+        # Use traditional mkdocs gh-deploy
+        if not build_and_publish_github_pages(False, dry_run):
+            print("Error: Failed to publish to GitHub Pages")
+            return False
+    
+    # Build versioned documentation
+    if versioned_docs:
+        build_versioned_docs(version, dry_run)
+    
+    return True
+
 def trigger_github_actions_workflow(dry_run=False):
     """Trigger a GitHub Actions workflow_dispatch event."""
     # Get GitHub repository information
@@ -215,12 +430,15 @@ def trigger_github_actions_workflow(dry_run=False):
         print(f"[DRY RUN] Would trigger workflow_dispatch for {github_owner}/{github_repo}")
         return True
     
+    # Check if GitHub CLI is installed
+    if not tool_available("gh"):
+        print("Error: GitHub CLI (gh) is not installed. Install it to trigger workflows.")
+        print("Visit: https://cli.github.com/")
+        return False
+    
     try:
-        # Check if GitHub CLI is installed
-        subprocess.run(["gh", "--version"], check=True, capture_output=True)
-        
         # Trigger workflow_dispatch
-        result = subprocess.run(
+        result = spawn(
             ["gh", "workflow", "run", "docs.yml", "--repo", f"{github_owner}/{github_repo}"],
             check=True,
             capture_output=True,
@@ -230,10 +448,6 @@ def trigger_github_actions_workflow(dry_run=False):
         print(f"\n=== Triggering GitHub Actions workflow ===")
         print(result.stdout or "Workflow triggered successfully")
         return True
-    except FileNotFoundError:
-        print("Error: GitHub CLI (gh) is not installed. Install it to trigger workflows.")
-        print("Visit: https://cli.github.com/")
-        return False
     except subprocess.CalledProcessError as e:
         print(f"Error triggering GitHub Actions workflow: {e}")
         print(f"Output: {e.stdout}")
@@ -244,7 +458,7 @@ def get_github_info():
     """Get GitHub repository information."""
     try:
         # Get remote URL
-        result = subprocess.run(
+        result = spawn(
             ["git", "config", "--get", "remote.origin.url"],
             check=True, capture_output=True, text=True
         )
@@ -254,10 +468,10 @@ def get_github_info():
         if "github.com" in remote_url:
             if remote_url.startswith("git@"):
                 # SSH format: git@github.com:owner/repo.git
-                match = re.search(r'github\.com:([^/]+)/([^/]+?)(?:\.git)?$', remote_url)
+                match = GITHUB_SSH_RE.search(remote_url)
             else:
                 # HTTPS format: https://github.com/owner/repo.git
-                match = re.search(r'github\.com/([^/]+)/([^/]+?)(?:\.git)?$', remote_url)
+                match = GITHUB_HTTPS_RE.search(remote_url)
             
             if match:
                 owner, repo = match.groups()
@@ -269,32 +483,30 @@ def get_github_info():
 
 def build_versioned_docs(version, dry_run=False):
     """Build and publish versioned documentation if mike is installed."""
-    try:
-        subprocess.run(["mike", "--version"], check=True, capture_output=True)
-        
-        # Deploy this version
+    if not tool_available("mike"):
+        print("Note: mike is not installed. Skipping versioned documentation.")
+        return True  # Not a failure, just skipped
+    
+    # Deploy this version
+    success, _ = run_command(
+        ["mike", "deploy", version],
+        f"Deploying version {version} with mike",
+        dry_run
+    )
+    if not success:
+        return False
+    
+    # Set as default if it's not a pre-release
+    if not PRERELEASE_RE.search(version):
         success, _ = run_command(
-            ["mike", "deploy", version],
-            f"Deploying version {version} with mike",
+            ["mike", "set-default", version],
+            f"Setting {version} as default",
             dry_run
         )
         if not success:
             return False
-        
-        # Set as default if it's not a pre-release
-        if not re.search(r'(a|b|rc|dev)', version):
-            success, _ = run_command(
-                ["mike", "set-default", version],
-                f"Setting {version} as default",
-                dry_run
-            )
-            if not success:
-                return False
-        
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        print("Note: mike is not installed. Skipping versioned documentation.")
-        return True  # Not a failure, just skipped
+    
+    return True
 
 def trigger_readthedocs_build(project_name, token, version="latest", dry_run=False):
     """Trigger a build on Read the Docs."""
@@ -351,23 +563,20 @@ def commit_and_push(files, version, dry_run=False):
         print("No files to commit")
         return True
     
+    # Skip the commit, and the push to the remote, if the files match HEAD
+    # (e.g. the version was changed and then changed back)
+    if not dry_run and spawn(["git", "diff", "--quiet", "HEAD", "--", *files]).returncode == 0:
+        print("Files are unchanged from HEAD, nothing to commit")
+        return True
+    
     # Get the current branch
     branch = get_current_branch()
     print(f"Current branch: {branch}")
     
-    # Add changes
-    for file in files:
-        success, _ = run_command(
-            ["git", "add", file],
-            f"Adding file: {file}",
-            dry_run
-        )
-        if not success:
-            return False
-    
-    # Commit changes
+    # Commit changes, passing the files to git commit so that they are staged
+    # by the same git process instead of a git add for each
     success, _ = run_command(
-        ["git", "commit", "-m", f"Update documentation for version {version}"],
+        ["git", "commit", "-m", f"Update documentation for version {version}", "--", *files],
         "Committing changes",
         dry_run
     )
@@ -376,7 +585,7 @@ def commit_and_push(files, version, dry_run=False):
     
     # Push changes
     success, _ = run_command(
-        ["git", "push", "origin", branch],
+        ["git", "push", "--atomic", "origin", branch],
         f"Pushing changes to {branch}",
         dry_run
     )
@@ -394,40 +603,15 @@ def print_platform_status():
     """Print the status of all documentation platforms."""
     print("\n=== Documentation Platforms Status ===")
     
-    # Check if MkDocs is installed
-    try:
-        subprocess.run(["mkdocs", "--version"], check=True, capture_output=True, text=True)
-        mkdocs_status = "✅ Installed"
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        mkdocs_status = "❌ Not installed"
-    
-    # Check if mike is installed
-    try:
-        subprocess.run(["mike", "--version"], check=True, capture_output=True, text=True)
-        mike_status = "✅ Installed"
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        mike_status = "❌ Not installed"
-    
-    # Check if twine is installed
-    try:
-        subprocess.run(["twine", "--version"], check=True, capture_output=True, text=True)
-        twine_status = "✅ Installed"
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        twine_status = "❌ Not installed"
-    
-    # Check if build is installed
-    try:
-        subprocess.run(["python3", "-m", "build", "--version"], check=True, capture_output=True, text=True)
-        build_status = "✅ Installed"
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        build_status = "❌ Not installed"
+    # Check which tools are installed (twine and build are run with python3 -m)
+    def status(installed):
+        return "✅ Installed" if installed else "❌ Not installed"
     
-    # Check for GitHub CLI
-    try:
-        subprocess.run(["gh", "--version"], check=True, capture_output=True, text=True)
-        gh_cli_status = "✅ Installed"
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        gh_cli_status = "❌ Not installed"
+    mkdocs_status = status(tool_available("mkdocs"))
+    mike_status = status(tool_available("mike"))
+    twine_status = status(tool_available("twine", module=True))
+    build_status = status(tool_available("build", module=True))
+    gh_cli_status = status(tool_available("gh"))
     
     # Check for config files
     readthedocs_yaml = "✅ Found" if (ROOT_DIR / ".readthedocs.yml").exists() else "❌ Not found"
@@ -534,31 +718,17 @@ Supported Documentation Platforms:
         print("Error: Failed to commit and push changes")
         return 1
     
-    # Build and publish to PyPI
-    if not args.no_pypi:
-        if not build_and_publish_pypi(args.dry_run):
-            print("Error: Failed to publish to PyPI")
-            return 1
+    # Publish to PyPI, then to GitHub Pages. The two don't depend on each other,
+    # but are run in turn: both write to the terminal and may prompt for credentials.
+    if not args.no_pypi and not build_and_publish_pypi(args.dry_run):
+        print("Error: Failed to publish to PyPI")
+        return 1
     
-    # Build and deploy to GitHub Pages
     if not args.no_github_pages:
         # Determine whether to use GitHub Actions or mkdocs gh-deploy
         use_github_actions = args.github_actions or (has_github_actions and not args.dry_run)
-        
-        if use_github_actions:
-            # Trigger GitHub Actions workflow
-            if not trigger_github_actions_workflow(args.dry_run):
-                print("Warning: Failed to trigger GitHub Actions workflow")
-                print("Documentation will still be built on next push to main branch")
-        else:
-            # Use traditional mkdocs gh-deploy
-            if not build_and_publish_github_pages(False, args.dry_run):
-                print("Error: Failed to publish to GitHub Pages")
-                return 1
-    
-    # Build versioned documentation
-    if not args.no_github_pages and not args.github_actions:
-        build_versioned_docs(version, args.dry_run)
+        if not publish_github_pages(version, use_github_actions, not args.github_actions, args.dry_run):
+            return 1
     
     # Trigger Read the Docs build if requested
     if args.trigger_rtd_build and not args.no_rtd:
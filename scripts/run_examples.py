@@ -6,9 +6,11 @@ This script runs the examples in the examples directory.
 """
 
 import argparse
+import asyncio
 import os
 import subprocess
 import sys
+from typing import List, Optional, Tuple
 
 # Available examples
 EXAMPLES = {
@@ -38,11 +40,75 @@ SIMPLIFIED_NAMES = {
     "asset_swap": "asset_swap/simple_swap.py",
 }
 
+# Every accepted name (path or file name) mapped to its example, built once;
+# the first example with a given file name wins, and simplified names take precedence
+EXAMPLE_PATHS = {}
+# Each example mapped to its path relative to the repository root
+EXAMPLE_FULL_PATHS = {}
+for _examples in EXAMPLES.values():
+    for _example in _examples:
+        EXAMPLE_FULL_PATHS[_example] = os.path.join("examples", _example)
+        EXAMPLE_PATHS.setdefault(_example, _example)
+        EXAMPLE_PATHS.setdefault(_example.rsplit("/", 1)[-1], _example)
+EXAMPLE_PATHS.update(SIMPLIFIED_NAMES)
+
+async def run_example(example_path: str) -> Tuple[str, int, bytes]:
+    """
+    Run an example in a subprocess, capturing its output.
+    
+    Args:
+        example_path: Path of the example, relative to the examples directory.
+        
+    Returns:
+        The example path, its exit code and its combined stdout and stderr.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, EXAMPLE_FULL_PATHS[example_path],
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        close_fds=False,  # Lets subprocess use posix_spawn instead of fork
+    )
+    output, _ = await proc.communicate()
+    return example_path, proc.returncode, output
+
+async def run_examples(example_paths: List[str], jobs: Optional[int] = None) -> int:
+    """
+    Run examples concurrently, printing each one's output once it finishes.
+    
+    Args:
+        example_paths: Paths of the examples, relative to the examples directory.
+        jobs: Maximum number of examples running at once, or None for all of them.
+        
+    Returns:
+        The number of examples that failed.
+    """
+    limit = asyncio.Semaphore(jobs or len(example_paths) or 1)
+    
+    async def run_limited(example_path: str) -> Tuple[str, int, bytes]:
+        async with limit:
+            return await run_example(example_path)
+    
+    failed = 0
+    for result in asyncio.as_completed([run_limited(path) for path in example_paths]):
+        example_path, returncode, output = await result
+        # Output is buffered so that concurrent examples don't interleave, and
+        # written together with its header in one write
+        sys.stdout.write(f"=== {example_path} (exit code {returncode}) ===\n"
+                         f"{output.decode(errors='replace')}\n")
+        sys.stdout.flush()
+        if returncode != 0:
+            failed += 1
+    return failed
+
 def main():
     # Parse arguments
     parser = argparse.ArgumentParser(description="Run Evrmore RPC examples")
     parser.add_argument("example", nargs="?", help="Example to run")
     parser.add_argument("--list", action="store_true", help="List available examples")
+    parser.add_argument("--all", action="store_true",
+                        help="Run all basic examples concurrently (advanced examples run until interrupted)")
+    parser.add_argument("--jobs", type=int,
+                        help="Maximum number of examples to run at once with --all (default: all)")
     args = parser.parse_args()
     
     # List examples
@@ -59,21 +125,19 @@ def main():
             print(f"  {name} -> {path}")
         return
     
+    # Run all basic examples
+    if args.all:
+        jobs = max(args.jobs, 1) if args.jobs is not None else None
+        failed = asyncio.run(run_examples(EXAMPLES["basic"], jobs))
+        if failed:
+            print(f"{failed} of {len(EXAMPLES['basic'])} examples failed")
+            sys.exit(1)
+        return
+    
     # Run example
     if args.example:
-        # Check if it's a simplified name
-        if args.example in SIMPLIFIED_NAMES:
-            example_path = SIMPLIFIED_NAMES[args.example]
-        else:
-            # Find the example
-            example_path = None
-            for category in EXAMPLES:
-                for example in EXAMPLES[category]:
-                    if example == args.example or example.endswith(f"/{args.example}"):
-                        example_path = example
-                        break
-                if example_path:
-                    break
+        # Find the example by simplified name, path or file name
+        example_path = EXAMPLE_PATHS.get(args.example)
         
         if not example_path:
             print(f"Example '{args.example}' not found")
@@ -81,10 +145,10 @@ def main():
         
         # Run the example
         print(f"Running example: {example_path}")
-        example_full_path = os.path.join("examples", example_path)
+        example_full_path = EXAMPLE_FULL_PATHS[example_path]
         
         try:
-            subprocess.run([sys.executable, example_full_path], check=True)
+            subprocess.run([sys.executable, example_full_path], check=True, close_fds=False)
         except subprocess.CalledProcessError:
             print(f"Example '{example_path}' failed")
         except KeyboardInterrupt:
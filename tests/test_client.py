@@ -4,11 +4,14 @@ Tests for the EvrmoreClient class.
 """
 
 import os
+import json
 import pytest
 import asyncio
+from decimal import Decimal
 from unittest.mock import patch, MagicMock, AsyncMock
 
-from evrmore_rpc import EvrmoreClient, EvrmoreRPCError
+from evrmore_rpc import EvrmoreClient, EvrmoreRPCError, get_default_client
+from evrmore_rpc.client import HAS_ORJSON, _OrjsonDecoder
 
 # Skip tests if no Evrmore node is available
 pytestmark = pytest.mark.skipif(
@@ -40,6 +43,57 @@ class TestEvrmoreClient:
             assert result == "test_result"
             mock_post.assert_called_once()
     
+    def test_use_decimal(self):
+        """Test decoding response amounts as Decimal."""
+        with patch('requests.Session.post') as mock_post:
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.json.side_effect = lambda **kwargs: json.loads(
+                '{"result": {"amount": 0.1}, "error": null, "id": 1}', **kwargs
+            )
+            mock_post.return_value = mock_response
+            
+            client = EvrmoreClient(use_decimal=True)
+            client.force_sync()
+            result = client.execute_command("getassetdata", "ASSET")
+            
+            assert result["amount"] == Decimal("0.1")
+    
+    @pytest.mark.skipif(not HAS_ORJSON, reason="orjson is not installed")
+    def test_orjson_decoding(self):
+        """Test decoding responses with orjson."""
+        with patch('requests.Session.post') as mock_post:
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.json.side_effect = lambda **kwargs: json.loads(
+                '{"result": {"amount": 0.1}, "error": null, "id": 1}', **kwargs
+            )
+            mock_post.return_value = mock_response
+            
+            client = EvrmoreClient()
+            client.force_sync()
+            result = client.execute_command("getassetdata", "ASSET")
+            
+            assert mock_response.json.call_args.kwargs["cls"] is _OrjsonDecoder
+            assert result["amount"] == 0.1
+    
+    def test_session_reuse(self):
+        """Test that calls share one keep-alive session."""
+        with patch('requests.Session.post') as mock_post:
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.json.return_value = {"result": 1, "error": None, "id": 1}
+            mock_post.return_value = mock_response
+            
+            client = EvrmoreClient()
+            client.force_sync()
+            client.getblockcount()
+            session = client.sync_session
+            client.getblockcount()
+            
+            assert client.sync_session is session
+            assert mock_post.call_count == 2
+    
     @pytest.mark.asyncio
     async def test_async_call(self):
         """Test asynchronous RPC call."""
@@ -49,7 +103,7 @@ class TestEvrmoreClient:
             mock_response.status = 200
             
             # Set up the json method to return a coroutine that returns the result
-            async def mock_json():
+            async def mock_json(**kwargs):
                 return {"result": "test_result", "error": None, "id": 1}
             
             mock_response.json = mock_json
@@ -85,6 +139,128 @@ class TestEvrmoreClient:
             
             assert "Test error" in str(excinfo.value)
     
+    def test_batch_call(self):
+        """Test synchronous batch RPC call."""
+        with patch('requests.Session.post') as mock_post:
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            # Responses may arrive out of order and are matched by id
+            mock_response.json.return_value = [
+                {"result": "second", "error": None, "id": 1},
+                {"result": "first", "error": None, "id": 0},
+            ]
+            mock_post.return_value = mock_response
+            
+            client = EvrmoreClient()
+            client.force_sync()
+            results = client.batch_call([("getblockhash", [1]), ("getblockhash", [2])])
+            
+            assert results == ["first", "second"]
+            mock_post.assert_called_once()
+            payload = mock_post.call_args.kwargs["json"]
+            assert [request["method"] for request in payload] == ["getblockhash", "getblockhash"]
+            assert [request["params"] for request in payload] == [(1,), (2,)]
+    
+    def test_batch_call_error(self):
+        """Test error handling in batch RPC calls."""
+        with patch('requests.Session.post') as mock_post:
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.json.return_value = [
+                {"result": "first", "error": None, "id": 0},
+                {"result": None, "error": {"code": -5, "message": "Block not found"}, "id": 1},
+            ]
+            mock_post.return_value = mock_response
+            
+            client = EvrmoreClient()
+            client.force_sync()
+            with pytest.raises(EvrmoreRPCError) as excinfo:
+                client.batch_call([("getblock", ["a"]), ("getblock", ["b"])])
+            
+            assert "Block not found" in str(excinfo.value)
+            
+            results = client.batch_call([("getblock", ["a"]), ("getblock", ["b"])], return_exceptions=True)
+            assert results[0] == "first"
+            assert isinstance(results[1], EvrmoreRPCError)
+    
+    def test_batch_call_rejected(self):
+        """Test that a batch rejected as a whole raises instead of returning one result."""
+        with patch('requests.Session.post') as mock_post:
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.json.return_value = {
+                "result": None,
+                "error": {"code": -32600, "message": "Invalid Request"},
+                "id": None
+            }
+            mock_post.return_value = mock_response
+            
+            client = EvrmoreClient()
+            client.force_sync()
+            with pytest.raises(EvrmoreRPCError) as excinfo:
+                client.batch_call([("getblock", ["a"]), ("getblock", ["b"])], return_exceptions=True)
+            
+            assert "Invalid Request" in str(excinfo.value)
+            
+            mock_response.json.return_value = {"result": "first", "error": None, "id": 0}
+            with pytest.raises(EvrmoreRPCError) as excinfo:
+                client.batch_call([("getblock", ["a"]), ("getblock", ["b"])])
+            
+            assert "Invalid batch response" in str(excinfo.value)
+    
+    def test_stress_test_sync(self):
+        """Test synchronous stress test statistics."""
+        with patch.object(EvrmoreClient, 'execute_command_sync', return_value=42) as mock_execute:
+            client = EvrmoreClient()
+            client.force_sync()
+            results = client.stress_test(num_calls=25, concurrency=4)
+            
+            assert mock_execute.call_count == 25
+            assert results["num_calls"] == 25
+            assert results["last_result"] == 42
+            assert results["min_time"] <= results["median_time"] <= results["max_time"]
+    
+    @pytest.mark.asyncio
+    async def test_stress_test_async(self):
+        """Test that the asynchronous stress test bounds in-flight calls."""
+        in_flight = 0
+        max_in_flight = 0
+        
+        async def mock_execute(command, *args):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return 42
+        
+        with patch.object(EvrmoreClient, 'execute_command_async', side_effect=mock_execute):
+            client = EvrmoreClient()
+            client.force_async()
+            await client.initialize_async()
+            results = await client.stress_test(num_calls=25, concurrency=4)
+            await client.close()
+            
+            assert max_in_flight == 4
+            assert results["num_calls"] == 25
+            assert results["last_result"] == 42
+    
+    def test_stress_test_batch_size(self):
+        """Test that stress tests reject batch sizes below 1."""
+        client = EvrmoreClient()
+        client.force_sync()
+        for batch_size in (0, -1):
+            with pytest.raises(ValueError):
+                client.stress_test(num_calls=10, batch_size=batch_size)
+    
+    @pytest.mark.asyncio
+    async def test_stress_test_async_batch_size(self):
+        """Test that asynchronous stress tests reject batch sizes below 1."""
+        client = EvrmoreClient()
+        client.force_async()
+        with pytest.raises(ValueError):
+            await client.stress_test(num_calls=10, batch_size=0)
+    
     def test_reset(self):
         """Test client reset."""
         client = EvrmoreClient()
@@ -106,4 +282,11 @@ class TestEvrmoreClient:
         """Test force_async method."""
         client = EvrmoreClient()
         client = client.force_async()
-        assert client._async_mode is True 
\ No newline at end of file
+        assert client._async_mode is True
+    
+    def test_get_default_client(self):
+        """Test that the default client is shared per set of options."""
+        client = get_default_client(use_decimal=True)
+        assert client is get_default_client(use_decimal=True)
+        assert client is not get_default_client()
+        assert client._json_kwargs == {'parse_float': Decimal}
\ No newline at end of file
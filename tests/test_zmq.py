@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Tests for the EvrmoreZMQClient class.
+"""
+
+import asyncio
+import pytest
+
+from evrmore_rpc.zmq.client import HAS_ZMQ, RECV_BATCH_SIZE, EvrmoreZMQClient, ZMQTopic
+from evrmore_rpc.zmq.models import ZMQNotification
+
+if HAS_ZMQ:
+    import zmq
+
+pytestmark = pytest.mark.skipif(not HAS_ZMQ, reason="pyzmq is not installed")
+
+# Topic whose notifications the tests use to know the client has caught up
+MARKER_TOPIC = ZMQTopic.RAW_TX
+
+class Publisher:
+    """Local PUB socket standing in for an Evrmore node."""
+    
+    def __init__(self):
+        self.context = zmq.Context()
+        self.socket = self.context.socket(zmq.PUB)
+        self.socket.setsockopt(zmq.SNDHWM, 0)
+        self.port = self.socket.bind_to_random_port("tcp://127.0.0.1")
+        self.markers = 0
+    
+    def send(self, topic, sequence, body=b"\x00" * 32):
+        """Publish a notification as an Evrmore node does."""
+        self.socket.send_multipart([topic.value, body, sequence.to_bytes(4, "little")])
+    
+    async def sync(self, received):
+        """
+        Publish a marker and wait until the client has handled it.
+        
+        The receive loop handles messages in order, so once the marker is handled
+        every message published before it has been too.
+        """
+        self.markers += 1
+        for _ in range(100):
+            # Resent until handled, as the subscription may not have reached
+            # the publisher yet; duplicates are harmless
+            self.send(MARKER_TOPIC, self.markers)
+            await asyncio.sleep(0.05)
+            if self.markers in received:
+                return
+        raise TimeoutError("ZMQ client did not receive the marker")
+    
+    def close(self):
+        """Close the socket and its context."""
+        self.socket.close(linger=0)
+        self.context.term()
+
+@pytest.fixture
+def publisher():
+    publisher = Publisher()
+    yield publisher
+    publisher.close()
+
+async def start_client(publisher, **kwargs):
+    """Start a client connected to the publisher, with a marker handler registered."""
+    client = EvrmoreZMQClient(zmq_port=publisher.port, **kwargs)
+    markers = []
+    
+    @client.on(MARKER_TOPIC)
+    async def handle_marker(notification):
+        markers.append(notification.sequence)
+    
+    await client.start()
+    await publisher.sync(markers)
+    return client, markers
+
+class TestEvrmoreZMQClient:
+    """Tests for the EvrmoreZMQClient class."""
+    
+    async def test_rcvhwm(self, publisher):
+        """Test that the receive high water mark is applied to the socket."""
+        client, _ = await start_client(publisher, rcvhwm=1234)
+        try:
+            assert client.socket.getsockopt(zmq.RCVHWM) == 1234
+        finally:
+            await client.stop()
+    
+    async def test_conflate_topics(self, publisher):
+        """Test that a conflated topic's handler only sees the newest pending notification."""
+        client, markers = await start_client(publisher, conflate_topics={ZMQTopic.HASH_BLOCK})
+        seen = []
+        busy = asyncio.Event()
+        release = asyncio.Event()
+        
+        @client.on(ZMQTopic.HASH_BLOCK)
+        async def handle_block(notification):
+            seen.append(notification.sequence)
+            busy.set()
+            await release.wait()
+        
+        try:
+            publisher.send(ZMQTopic.HASH_BLOCK, 0)
+            await asyncio.wait_for(busy.wait(), 5)
+            
+            # A burst arriving while the handler is busy
+            for sequence in range(1, 10):
+                publisher.send(ZMQTopic.HASH_BLOCK, sequence)
+            await publisher.sync(markers)
+            
+            release.set()
+            for _ in range(100):
+                if len(seen) == 2:
+                    break
+                await asyncio.sleep(0.01)
+            
+            assert seen == [0, 9]
+        finally:
+            await client.stop()
+    
+    async def test_unconflated_topics_in_order(self, publisher):
+        """Test that topics not conflated still receive every notification in order."""
+        client, markers = await start_client(publisher, conflate_topics={ZMQTopic.HASH_BLOCK})
+        seen = []
+        
+        @client.on(ZMQTopic.HASH_TX)
+        async def handle_tx(notification):
+            seen.append(notification.sequence)
+        
+        @client.on(ZMQTopic.HASH_BLOCK)
+        async def handle_block(notification):
+            await asyncio.sleep(0.01)
+        
+        try:
+            for sequence in range(100):
+                publisher.send(ZMQTopic.HASH_TX, sequence)
+                publisher.send(ZMQTopic.HASH_BLOCK, sequence)
+            await publisher.sync(markers)
+            
+            assert seen == list(range(100))
+        finally:
+            await client.stop()
+    
+    async def test_conflate_after_idle(self, publisher):
+        """Test that a conflated notification sent after an idle period is still delivered."""
+        client, markers = await start_client(publisher, conflate_topics={ZMQTopic.HASH_BLOCK})
+        seen = []
+        
+        @client.on(ZMQTopic.HASH_BLOCK)
+        async def handle_block(notification):
+            seen.append(notification.sequence)
+        
+        try:
+            publisher.send(ZMQTopic.HASH_BLOCK, 0)
+            await publisher.sync(markers)
+            await asyncio.sleep(0.2)
+            
+            publisher.send(ZMQTopic.HASH_BLOCK, 1)
+            await publisher.sync(markers)
+            await asyncio.sleep(0.05)
+            
+            assert seen == [0, 1]
+        finally:
+            await client.stop()
+    
+    async def test_receive_more_than_batch(self, publisher):
+        """Test that more messages than one receive batch are all delivered in order."""
+        client, markers = await start_client(publisher)
+        seen = []
+        
+        @client.on(ZMQTopic.HASH_TX)
+        async def handle_tx(notification):
+            seen.append(notification.sequence)
+        
+        try:
+            count = RECV_BATCH_SIZE * 2 + 5
+            for sequence in range(count):
+                publisher.send(ZMQTopic.HASH_TX, sequence)
+            await asyncio.wait_for(publisher.sync(markers), 10)
+            
+            assert seen == list(range(count))
+        finally:
+            await client.stop()
+    
+    async def test_stop_mid_batch(self, publisher):
+        """Test that stop() ends the receive loop while it is draining a batch."""
+        client, markers = await start_client(publisher)
+        seen = []
+        draining = asyncio.Event()
+        
+        @client.on(ZMQTopic.HASH_TX)
+        async def handle_tx(notification):
+            seen.append(notification.sequence)
+            if len(seen) == 10:
+                draining.set()
+            await asyncio.sleep(0)
+        
+        for sequence in range(RECV_BATCH_SIZE):
+            publisher.send(ZMQTopic.HASH_TX, sequence)
+        await asyncio.wait_for(draining.wait(), 5)
+        task = client._task
+        
+        await asyncio.wait_for(client.stop(), 5)
+        
+        assert task.done()
+        assert len(seen) < RECV_BATCH_SIZE
+        assert seen == list(range(len(seen)))
+        assert client.socket is None and client.context is None
+    
+    async def test_dispatch_single_handler(self):
+        """Test dispatching a notification to a single handler."""
+        client = EvrmoreZMQClient()
+        notification = ZMQNotification(topic="hashblock", body=b"\x01" * 32, sequence=7)
+        seen = []
+        
+        @client.on(ZMQTopic.HASH_BLOCK)
+        async def handle_block(notification):
+            seen.append(notification)
+        
+        await client._dispatch(ZMQTopic.HASH_BLOCK.value, notification)
+        await client._dispatch(ZMQTopic.HASH_TX.value, notification)
+        
+        assert seen == [notification]
+    
+    async def test_dispatch_handler_error(self, caplog):
+        """Test that a handler raising does not stop the other handlers."""
+        client = EvrmoreZMQClient()
+        notification = ZMQNotification(topic="hashblock", body=b"\x01" * 32, sequence=7)
+        seen = []
+        
+        @client.on(ZMQTopic.HASH_BLOCK)
+        async def failing_handler(notification):
+            raise ValueError("handler failed")
+        
+        @client.on(ZMQTopic.HASH_BLOCK)
+        async def handle_block(notification):
+            seen.append(notification)
+        
+        await client._dispatch(ZMQTopic.HASH_BLOCK.value, notification)
+        
+        assert seen == [notification]
+        assert "handler failed" in caplog.text
\ No newline at end of file